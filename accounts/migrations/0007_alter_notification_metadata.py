@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-16 09:30
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_seed_notification_templates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='metadata',
+            field=models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Additional notification data'),
+        ),
+    ]
@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 import json
 import logging
 
@@ -126,7 +127,7 @@ class Notification(models.Model):
     related_document_id = models.IntegerField(null=True, blank=True)
 
     # Additional data
-    metadata = models.JSONField(default=dict, help_text='Additional notification data')
+    metadata = models.JSONField(default=dict, encoder=DjangoJSONEncoder, help_text='Additional notification data')
     template_used = models.ForeignKey(NotificationTemplate, on_delete=models.SET_NULL, null=True, blank=True)
 
     # Timestamps
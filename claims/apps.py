@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ClaimsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'claims'
+
+    def ready(self):
+        # Import signals to keep BenefitUsage in sync with claim approvals
+        import claims.signals  # noqa
@@ -0,0 +1,62 @@
+"""
+Rebuild BenefitUsage rows from approved claims.
+
+Run once after the BenefitUsage migration, or any time the running totals are
+suspected to have drifted (e.g. claims edited directly in the database).
+
+Usage:
+  python manage.py backfill_benefit_usage
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from claims.models import BenefitUsage, Claim
+from claims.services import _period_start
+from schemes.models import SchemeBenefit
+
+
+class Command(BaseCommand):
+    help = "Recompute BenefitUsage totals from approved claims."
+
+    def handle(self, *args, **options):
+        periods = {
+            (scheme_id, benefit_type_id): coverage_period
+            for scheme_id, benefit_type_id, coverage_period in SchemeBenefit.objects.values_list(
+                'scheme_id', 'benefit_type_id', 'coverage_period'
+            )
+        }
+
+        totals = defaultdict(lambda: [Decimal('0.00'), 0])
+        approved = Claim.objects.filter(status=Claim.Status.APPROVED).select_related('patient')
+        for claim in approved.iterator(chunk_size=2000):
+            period = periods.get((claim.patient.scheme_id, claim.service_type_id))
+            if period is None or period == SchemeBenefit.CoveragePeriod.PER_VISIT:
+                continue
+            start = _period_start(period, claim.date_submitted, claim.patient)
+            bucket = totals[(claim.patient_id, claim.service_type_id, start)]
+            bucket[0] += claim.cost
+            bucket[1] += 1
+
+        with transaction.atomic():
+            BenefitUsage.objects.all().delete()
+            BenefitUsage.objects.bulk_create(
+                [
+                    BenefitUsage(
+                        patient_id=patient_id,
+                        benefit_type_id=benefit_type_id,
+                        period_start=start,
+                        used_amount=amount,
+                        used_count=count,
+                    )
+                    for (patient_id, benefit_type_id, start), (amount, count) in totals.items()
+                ],
+                batch_size=1000,
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(totals)} benefit usage rows."))
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0005_remove_patient_subscription'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='preauthorizationrequest',
+            index=models.Index(fields=['status', 'priority', 'approval_expiry'], name='claims_prea_status_5f51b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fraudalert',
+            index=models.Index(fields=['status', 'severity', 'fraud_score'], name='claims_frau_status_e1fe14_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-16 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0006_fraudalert_stats_preauth_expiry_indexes'),
+        ('schemes', '0007_rename_schemes_sch_scheme__1c6e62_idx_schemes_sch_scheme__f88f84_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BenefitUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateTimeField(help_text='Start of the coverage period this usage counts towards')),
+                ('used_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('used_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('benefit_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='schemes.benefittype')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='benefit_usage', to='claims.patient')),
+            ],
+            options={
+                'unique_together': {('patient', 'benefit_type', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-16 11:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('claims', '0007_benefitusage'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='claim',
+            index=models.Index(fields=['patient', 'service_type', 'status', 'date_submitted'], include=['cost'], name='claim_pat_svc_status_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='claim',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['patient', 'service_type', 'date_submitted'], include=['cost'], name='claim_approved_usage_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-16 12:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('claims', '0008_claim_covering_usage_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='fraudalert',
+            index=models.Index(fields=['provider', 'status', 'created_at'], name='fraud_provider_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='fraudalert',
+            index=models.Index(condition=models.Q(('fraud_score__gte', 0.8)), fields=['provider'], name='fraud_high_risk_partial'),
+        ),
+    ]
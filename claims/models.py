@@ -191,6 +191,19 @@ class Claim(models.Model):
 			# Coverage and processing indexes
 			models.Index(fields=['coverage_checked']),
 			models.Index(fields=['coverage_checked', 'status']),
+			
+			# Covering indexes for the usage/fraud window aggregates (Postgres INCLUDE)
+			models.Index(
+				fields=['patient', 'service_type', 'status', 'date_submitted'],
+				include=['cost'],
+				name='claim_pat_svc_status_date_idx',
+			),
+			models.Index(
+				fields=['patient', 'service_type', 'date_submitted'],
+				include=['cost'],
+				condition=models.Q(status='APPROVED'),
+				name='claim_approved_usage_idx',
+			),
 		]
 		ordering = ['-date_submitted']
 
@@ -267,6 +280,7 @@ class PreAuthorizationRequest(models.Model):
 			models.Index(fields=['provider', 'status', 'date_requested']),
 			models.Index(fields=['request_number']),
 			models.Index(fields=['status', 'priority', 'date_requested']),
+			models.Index(fields=['status', 'priority', 'approval_expiry']),
 		]
 		ordering = ['-date_requested']
 
@@ -458,6 +472,26 @@ class Invoice(models.Model):
 		return max(self.amount - self.amount_paid, 0)
 
 
+class BenefitUsage(models.Model):
+	"""Running approved-claim totals per patient, benefit type and coverage period.
+
+	Maintained by claims.signals whenever a claim moves into or out of APPROVED, so
+	balance checks read one row instead of re-aggregating the claim history.
+	"""
+	patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='benefit_usage')
+	benefit_type = models.ForeignKey(BenefitType, on_delete=models.CASCADE, related_name='usage')
+	period_start = models.DateTimeField(help_text='Start of the coverage period this usage counts towards')
+	used_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+	used_count = models.IntegerField(default=0)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		unique_together = ('patient', 'benefit_type', 'period_start')
+
+	def __str__(self) -> str:  # pragma: no cover
+		return f"Usage {self.patient_id}/{self.benefit_type_id} from {self.period_start:%Y-%m-%d}: {self.used_amount} ({self.used_count})"
+
+
 class FraudAlert(models.Model):
 	"""Advanced fraud detection alert system"""
 
@@ -520,6 +554,12 @@ class FraudAlert(models.Model):
 			models.Index(fields=['patient', 'created_at']),
 			models.Index(fields=['provider', 'created_at']),
 			models.Index(fields=['fraud_score', 'status']),
+			# Covers the per-status/per-severity counts in the alert stats endpoint
+			models.Index(fields=['status', 'severity', 'fraud_score']),
+			# Provider-scoped alert lists filtered by status, newest first
+			models.Index(fields=['provider', 'status', 'created_at'], name='fraud_provider_status_idx'),
+			# high_risk_alerts in the stats endpoint, overall and per provider
+			models.Index(fields=['provider'], condition=models.Q(fraud_score__gte=0.8), name='fraud_high_risk_partial'),
 		]
 
 	def __str__(self) -> str:
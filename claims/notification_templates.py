@@ -0,0 +1,208 @@
+"""
+HTML bodies for claim decision notifications sent to providers.
+
+Each template is parsed once at import into its static segments and the few
+dynamic slots, so rendering only formats those values and joins the pieces
+instead of rebuilding the whole markup on every call.
+"""
+
+from string import Formatter
+
+
+class SegmentTemplate:
+    """A str.format-style template pre-split into literal and field segments."""
+
+    def __init__(self, source: str):
+        self.segments = tuple(
+            (literal, field, spec)
+            for literal, field, spec, _conversion in Formatter().parse(source)
+        )
+
+    def render(self, **context) -> str:
+        parts = []
+        for literal, field, spec in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(format(context[field], spec))
+        return ''.join(parts)
+
+
+CLAIM_APPROVED_HTML = SegmentTemplate("""
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #10b981; border-bottom: 2px solid #10b981; padding-bottom: 10px;">
+        ✓ Claim Approved - Full Coverage
+    </h2>
+
+    <div style="background-color: #f0fdf4; border-left: 4px solid #10b981; padding: 15px; margin: 20px 0;">
+        <p style="margin: 0; color: #15803d; font-weight: bold;">
+            The claim has been fully approved by the medical aid scheme.
+        </p>
+    </div>
+
+    <h3 style="color: #374151; margin-top: 20px;">Claim Details</h3>
+    <table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
+        <tr style="background-color: #f9fafb;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Claim ID</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{claim_id}</td>
+        </tr>
+        <tr>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Member ID</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{member_id}</td>
+        </tr>
+        <tr style="background-color: #f9fafb;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Service Type</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{service_type}</td>
+        </tr>
+        <tr>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Date of Service</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{date_of_service}</td>
+        </tr>
+    </table>
+
+    <h3 style="color: #374151; margin-top: 20px;">Payment Breakdown</h3>
+    <table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
+        <tr style="background-color: #f9fafb;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Total Claim Amount</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right;">R {claim_amount:,.2f}</td>
+        </tr>
+        <tr style="background-color: #e0f2fe;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Scheme Payment</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right; font-weight: bold; color: #0369a1;">R {scheme_payment:,.2f}</td>
+        </tr>
+        <tr>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Member Responsibility</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right;">R {member_responsibility:,.2f}</td>
+        </tr>
+    </table>
+{responsibility_details}
+    <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e5e7eb; color: #6b7280; font-size: 0.875rem;">
+        <p>This is an automated notification from the Medical Aid Management System.</p>
+        <p>Approved by: {approved_by}</p>
+    </div>
+</div>
+""")
+
+# Optional block of CLAIM_APPROVED_HTML, only rendered when the member owes something
+CLAIM_APPROVED_RESPONSIBILITY_HTML = SegmentTemplate("""
+    <div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0;">
+        <h4 style="margin-top: 0; color: #92400e;">Member Responsibility Details</h4>
+        <ul style="margin: 10px 0; padding-left: 20px;">
+            {items}
+        </ul>
+        <p style="margin-bottom: 0; color: #92400e; font-weight: bold;">
+            Please collect R {member_responsibility:,.2f} from the member.
+        </p>
+    </div>
+""")
+
+CLAIM_PARTIAL_APPROVAL_HTML = SegmentTemplate("""
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #059669;">Partial Claim Approval</h2>
+    <p>Your claim has been <strong>partially approved</strong> up to the remaining coverage limit.</p>
+
+    <div style="background-color: #f0fdf4; border-left: 4px solid #059669; padding: 15px; margin: 20px 0;">
+        <h3 style="margin-top: 0; color: #047857;">Claim Details</h3>
+        <table style="width: 100%; border-collapse: collapse;">
+            <tr>
+                <td style="padding: 8px 0;"><strong>Claim ID:</strong></td>
+                <td style="padding: 8px 0;">{claim_id}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px 0;"><strong>Member ID:</strong></td>
+                <td style="padding: 8px 0;">{member_id}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px 0;"><strong>Service:</strong></td>
+                <td style="padding: 8px 0;">{service_type}</td>
+            </tr>
+        </table>
+    </div>
+
+    <div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0;">
+        <h3 style="margin-top: 0; color: #d97706;">Payment Breakdown</h3>
+        <table style="width: 100%; border-collapse: collapse;">
+            <tr>
+                <td style="padding: 8px 0;"><strong>Total Claim Amount:</strong></td>
+                <td style="padding: 8px 0; text-align: right;">{claim_amount:,.2f}</td>
+            </tr>
+            <tr style="color: #059669;">
+                <td style="padding: 8px 0;"><strong>Approved Amount (Scheme):</strong></td>
+                <td style="padding: 8px 0; text-align: right; font-weight: bold;">{approved_amount:,.2f}</td>
+            </tr>
+            <tr style="color: #dc2626;">
+                <td style="padding: 8px 0;"><strong>Member Responsibility:</strong></td>
+                <td style="padding: 8px 0; text-align: right; font-weight: bold;">{member_responsibility:,.2f}</td>
+            </tr>
+        </table>
+    </div>
+
+    <div style="background-color: #fee2e2; border-left: 4px solid #dc2626; padding: 15px; margin: 20px 0;">
+        <h4 style="margin-top: 0; color: #991b1b;">⚠️ Action Required</h4>
+        <p style="margin-bottom: 0;">Please collect <strong>{member_responsibility:,.2f}</strong> from the member as their share of the claim cost.</p>
+    </div>
+
+    <p style="color: #6b7280; font-size: 12px; margin-top: 20px;">
+        Coverage period started: {period_start}<br>
+        This approval is based on the remaining coverage limit for this benefit period.
+    </p>
+</div>
+""")
+
+CLAIM_REJECTED_HTML = SegmentTemplate("""
+<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <h2 style="color: #dc2626; border-bottom: 2px solid #dc2626; padding-bottom: 10px;">
+        ✗ Claim Rejected
+    </h2>
+
+    <div style="background-color: #fef2f2; border-left: 4px solid #dc2626; padding: 15px; margin: 20px 0;">
+        <p style="margin: 0; color: #991b1b; font-weight: bold;">
+            This claim has been rejected by the medical aid scheme.
+        </p>
+    </div>
+
+    <h3 style="color: #374151; margin-top: 20px;">Claim Details</h3>
+    <table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
+        <tr style="background-color: #f9fafb;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Claim ID</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{claim_id}</td>
+        </tr>
+        <tr>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Member ID</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{member_id}</td>
+        </tr>
+        <tr style="background-color: #f9fafb;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Service Type</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{service_type}</td>
+        </tr>
+        <tr>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Claim Amount</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right;">R {claim_amount:,.2f}</td>
+        </tr>
+        <tr style="background-color: #f9fafb;">
+            <td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Date of Service</td>
+            <td style="padding: 10px; border: 1px solid #e5e7eb;">{date_of_service}</td>
+        </tr>
+    </table>
+
+    <div style="background-color: #fee2e2; border-left: 4px solid #dc2626; padding: 15px; margin: 20px 0;">
+        <h4 style="margin-top: 0; color: #991b1b;">Rejection Reason</h4>
+        <p style="margin: 0; color: #7f1d1d;">
+            {rejection_reason}
+        </p>
+    </div>
+
+    <div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0;">
+        <h4 style="margin-top: 0; color: #92400e;">Action Required</h4>
+        <p style="margin-bottom: 0; color: #92400e;">
+            • Inform the member that this claim was not approved<br>
+            • The member is responsible for the full amount of R {claim_amount:,.2f}<br>
+            • Review the rejection reason before resubmitting
+        </p>
+    </div>
+
+    <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e5e7eb; color: #6b7280; font-size: 0.875rem;">
+        <p>This is an automated notification from the Medical Aid Management System.</p>
+        <p>Rejected by: {rejected_by}</p>
+    </div>
+</div>
+""")
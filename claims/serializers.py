@@ -356,18 +356,20 @@ class PreAuthorizationRequestSerializer(serializers.ModelSerializer):
 
 
 class PreAuthorizationApprovalSerializer(serializers.ModelSerializer):
-    request_detail = PreAuthorizationRequestSerializer(source='request', read_only=True)
+    request_number = serializers.CharField(source='preauth_request.request_number', read_only=True)
+    request_status = serializers.CharField(source='preauth_request.status', read_only=True)
+    approval_expiry = serializers.DateField(source='preauth_request.approval_expiry', read_only=True)
     approved_by_username = serializers.CharField(source='approved_by.username', read_only=True)
-    benefit_type_name = serializers.CharField(source='benefit_type.name', read_only=True)
 
     class Meta:
         model = PreAuthorizationApproval
         fields = [
-            'id', 'request', 'request_detail', 'benefit_type', 'benefit_type_name', 
-            'approved_amount', 'approved_conditions', 'approval_notes', 'approved_by', 
-            'approved_by_username', 'approved_date', 'is_active', 'expires_at'
+            'id', 'preauth_request', 'request_number', 'request_status', 'approval_type',
+            'approved_amount', 'max_visits', 'validity_period_days', 'conditions', 'exclusions',
+            'requires_followup', 'followup_notes', 'approved_by', 'approved_by_username',
+            'approved_date', 'approval_reference', 'approval_expiry'
         ]
-        read_only_fields = ['approved_by', 'approved_date']
+        read_only_fields = ['approved_by', 'approved_date', 'approval_reference']
 
 
 class FraudAlertSerializer(serializers.ModelSerializer):
@@ -2,13 +2,14 @@ from datetime import datetime, timedelta, timezone
 from typing import Tuple, Dict, List, Optional
 from decimal import Decimal
 from django.db import models
-from django.db.models import Sum, Q, Count, Case, When
+from django.db.models import Sum, Q, Count, Case, When, F
 from django.utils import timezone as djtz
 from django.core.exceptions import ValidationError
 
-from .models import Claim, Patient, PreAuthorizationRequest, PreAuthorizationApproval, FraudAlert
+from .models import Claim, Patient, PreAuthorizationRequest, PreAuthorizationApproval, FraudAlert, BenefitUsage
 from schemes.models import SchemeBenefit, BenefitType, MemberSubscription
 from core.models import Alert, SystemSettings
+from core.cache import CacheManager, PREAUTH_RULES_ACTIVE_KEY, SCHEME_BENEFIT_KEY
 
 
 def _period_start(period: str, now: datetime, patient: Patient = None) -> datetime:
@@ -57,7 +58,11 @@ class PreAuthorizationService:
     def _load_rules(self):
         """Load active approval rules into cache"""
         from .models import PreAuthorizationRule
-        self.rules_cache = list(PreAuthorizationRule.objects.filter(is_active=True).order_by('priority'))
+        self.rules_cache = CacheManager.get_or_set(
+            PREAUTH_RULES_ACTIVE_KEY,
+            lambda: list(PreAuthorizationRule.objects.filter(is_active=True).order_by('priority')),
+            timeout=600,
+        )
 
     def check_auto_approval_eligibility(self, preauth_request) -> bool:
         """Check if a pre-authorization request qualifies for auto-approval"""
@@ -400,6 +405,66 @@ def validate_and_process_claim(claim: Claim) -> Tuple[bool, float, str]:
     return True, payable, "OK"
 
 
+def get_scheme_benefit(scheme_id: int, benefit_type_id: int) -> Optional[SchemeBenefit]:
+    """Scheme benefit configuration for a benefit type, cached until the benefit changes"""
+    return CacheManager.get_or_set(
+        SCHEME_BENEFIT_KEY.format(scheme_id=scheme_id, benefit_type_id=benefit_type_id),
+        lambda: SchemeBenefit.objects.select_related('benefit_type').filter(
+            scheme_id=scheme_id, benefit_type_id=benefit_type_id
+        ).first(),
+        timeout=600,
+    )
+
+
+def _to_cents(amount) -> int:
+    """Currency amount as integer cents"""
+    return int(round(amount * 100))
+
+
+def patient_responsibility(benefit: SchemeBenefit, cost) -> Tuple[Decimal, Decimal]:
+    """(deductible, copay) the member owes on a claim, worked out in integer cents"""
+    claim_c = _to_cents(cost)
+    deductible_c = min(_to_cents(benefit.deductible_amount or 0), claim_c)
+    after_c = claim_c - deductible_c
+    # A two-decimal percentage in cents is basis points; add half a unit to round half up
+    copay_c = _to_cents(benefit.copayment_fixed or 0) + (after_c * _to_cents(benefit.copayment_percentage or 0) + 5000) // 10000
+    return Decimal(deductible_c).scaleb(-2), Decimal(copay_c).scaleb(-2)
+
+
+def _usage_period_start(claim: Claim) -> Optional[datetime]:
+    """Coverage period bucket a claim's usage belongs to, or None if it isn't tracked"""
+    benefit = get_scheme_benefit(claim.patient.scheme_id, claim.service_type_id)
+    if benefit is None or benefit.coverage_period == SchemeBenefit.CoveragePeriod.PER_VISIT:
+        return None
+    return _period_start(benefit.coverage_period, claim.date_submitted, claim.patient)
+
+
+def adjust_benefit_usage(claim: Claim, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) an approved claim from its BenefitUsage row"""
+    start_date = _usage_period_start(claim)
+    if start_date is None:
+        return
+    bucket = dict(patient_id=claim.patient_id, benefit_type_id=claim.service_type_id, period_start=start_date)
+    if sign > 0:
+        BenefitUsage.objects.get_or_create(**bucket)
+    # Adjust in SQL so concurrent approvals for the same bucket don't lose updates
+    BenefitUsage.objects.filter(**bucket).update(
+        used_amount=F('used_amount') + sign * claim.cost,
+        used_count=F('used_count') + sign,
+        updated_at=djtz.now(),
+    )
+
+
+def get_benefit_usage(patient_id: int, benefit_type_id: int, start_date: datetime) -> Tuple[Decimal, int]:
+    """Approved (amount, count) used against a benefit since start_date"""
+    row = BenefitUsage.objects.filter(
+        patient_id=patient_id,
+        benefit_type_id=benefit_type_id,
+        period_start=start_date,
+    ).values_list('used_amount', 'used_count').first()
+    return row or (Decimal('0.00'), 0)
+
+
 def emit_low_balance_alerts(claim: Claim, benefit: SchemeBenefit = None, subscription: MemberSubscription = None, remaining_after: float = None, remaining_count: int | None = None):
     """Emit alerts for low balance on both benefit-specific and subscription-wide limits"""
 
@@ -0,0 +1,44 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Claim
+from .services import adjust_benefit_usage
+
+# Columns that decide a claim's BenefitUsage contribution: which bucket it lands in and how much it adds
+USAGE_FIELDS = ('status', 'cost', 'service_type_id', 'patient_id', 'date_submitted')
+_USAGE_UPDATE_FIELDS = {'status', 'cost', 'service_type', 'service_type_id', 'patient', 'patient_id', 'date_submitted'}
+
+
+@receiver(pre_save, sender=Claim)
+def remember_claim_status(sender, instance, update_fields=None, **kwargs):
+    """Record the stored usage columns so post_save can tell whether the claim's usage moved"""
+    if instance.pk is None:
+        instance._stored_usage = None
+    elif update_fields is not None and not _USAGE_UPDATE_FIELDS.intersection(update_fields):
+        instance._stored_usage = tuple(getattr(instance, field) for field in USAGE_FIELDS)
+    else:
+        instance._stored_usage = Claim.objects.filter(pk=instance.pk).values_list(*USAGE_FIELDS).first()
+
+
+@receiver(post_save, sender=Claim)
+def update_benefit_usage(sender, instance, **kwargs):
+    """Keep BenefitUsage in step with claims entering, leaving or changing while APPROVED"""
+    stored = instance.__dict__.pop('_stored_usage', None)
+    was_approved = stored is not None and stored[0] == Claim.Status.APPROVED
+    is_approved = instance.status == Claim.Status.APPROVED
+    if was_approved and is_approved:
+        if stored == tuple(getattr(instance, field) for field in USAGE_FIELDS):
+            return
+        # Still approved but re-priced or re-bucketed: take it out of the old bucket, add it to the new one
+        old = Claim(pk=instance.pk, **dict(zip(USAGE_FIELDS, stored)))
+        adjust_benefit_usage(old, -1)
+        adjust_benefit_usage(instance, 1)
+    elif was_approved != is_approved:
+        adjust_benefit_usage(instance, 1 if is_approved else -1)
+
+
+@receiver(post_delete, sender=Claim)
+def release_benefit_usage(sender, instance, **kwargs):
+    """Remove a deleted approved claim from its BenefitUsage row"""
+    if instance.status == Claim.Status.APPROVED:
+        adjust_benefit_usage(instance, -1)
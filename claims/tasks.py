@@ -0,0 +1,50 @@
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone as djtz
+import logging
+
+from .models import Claim
+from .services import _period_start, get_benefit_usage, get_scheme_benefit, emit_low_balance_alerts, emit_fraud_alert_if_needed
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def emit_approved_claim_alerts(claim_id):
+    """
+    Run low balance and fraud checks for an approved claim outside the request
+    """
+    try:
+        claim = Claim.objects.select_related(
+            'patient__scheme', 'patient__user', 'provider', 'service_type'
+        ).get(pk=claim_id)
+    except Claim.DoesNotExist:
+        logger.warning(f"Claim {claim_id} no longer exists, skipping alerts")
+        return
+
+    benefit = get_scheme_benefit(claim.patient.scheme_id, claim.service_type_id)
+    if benefit and benefit.coverage_amount is not None:
+        # BenefitUsage already includes this claim; it is updated when the claim is approved
+        start_date = _period_start(benefit.coverage_period, djtz.now(), claim.patient)
+        used_amount, used_count = get_benefit_usage(claim.patient_id, claim.service_type_id, start_date)
+
+        remaining_after = float(benefit.coverage_amount - used_amount)
+        remaining_count = None
+        if benefit.coverage_limit_count is not None:
+            remaining_count = max(benefit.coverage_limit_count - used_count, 0)
+
+        subscription = getattr(claim.patient, 'member_subscription', None)
+        emit_low_balance_alerts(claim, benefit, subscription, remaining_after, remaining_count)
+    emit_fraud_alert_if_needed(claim)
+
+
+def queue_approved_claim_alerts(claim_id):
+    """Schedule alerts once the approving transaction commits; run inline if the broker is down"""
+    def _dispatch():
+        try:
+            emit_approved_claim_alerts.delay(claim_id)
+        except Exception as e:
+            logger.error(f"Failed to queue alerts for claim {claim_id}, running inline: {str(e)}")
+            emit_approved_claim_alerts(claim_id)
+
+    transaction.on_commit(_dispatch)
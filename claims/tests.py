@@ -1,3 +1,45 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from claims.notification_templates import SegmentTemplate, CLAIM_REJECTED_HTML
+from claims.services import patient_responsibility
+from schemes.models import SchemeBenefit
+
+
+class SegmentTemplateTests(SimpleTestCase):
+    def test_render_interleaves_static_and_dynamic_segments(self):
+        tmpl = SegmentTemplate('<p>{name}</p><b>R {amount:,.2f}</b>')
+        self.assertEqual(tmpl.render(name='Claim', amount=Decimal('1234.5')), '<p>Claim</p><b>R 1,234.50</b>')
+
+    def test_rejection_template_includes_reason_and_amount(self):
+        html = CLAIM_REJECTED_HTML.render(
+            claim_id=7,
+            member_id='MBR-00007',
+            service_type='CONSULTATION',
+            claim_amount=Decimal('80.00'),
+            date_of_service='2025-01-01',
+            rejection_reason='Not covered',
+            rejected_by='admin',
+        )
+        self.assertIn('MBR-00007', html)
+        self.assertIn('Not covered', html)
+        self.assertIn('R 80.00', html)
+
+
+class PatientResponsibilityTests(SimpleTestCase):
+    def test_deductible_then_percentage_and_fixed_copay(self):
+        benefit = SchemeBenefit(
+            deductible_amount=Decimal('50.00'),
+            copayment_percentage=Decimal('12.50'),
+            copayment_fixed=Decimal('10.00'),
+        )
+        deductible, copay = patient_responsibility(benefit, Decimal('250.00'))
+        self.assertEqual(deductible, Decimal('50.00'))
+        self.assertEqual(copay, Decimal('35.00'))
+
+    def test_deductible_capped_at_claim_cost(self):
+        benefit = SchemeBenefit(deductible_amount=Decimal('500.00'))
+        deductible, copay = patient_responsibility(benefit, Decimal('80.00'))
+        self.assertEqual(deductible, Decimal('80.00'))
+        self.assertEqual(copay, Decimal('0.00'))
@@ -1,8 +1,11 @@
+from decimal import Decimal
+
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from schemes.models import SchemeCategory, SchemeBenefit, BenefitType
-from claims.models import Patient, Claim, Invoice
+from claims.models import Patient, Claim, Invoice, BenefitUsage
+from claims.models import PreAuthorizationRequest, PreAuthorizationApproval
 
 
 User = get_user_model()
@@ -106,3 +109,109 @@ class ClaimsWorkflowTests(APITestCase):
         resp = self.client.get(f'/api/patients/{self.patient.id}/coverage-balance/')
         self.assertEqual(resp.status_code, 200)
         self.assertIn('balances', resp.data)
+
+    def test_approved_claim_updates_benefit_usage(self):
+        self.auth(self.provider)
+        resp = self.client.post('/api/claims/', {
+            'patient': self.patient.id,
+            'service_type': self.bt_consult.id,
+            'cost': '25.00'
+        }, format='json')
+        self.assertEqual(resp.status_code, 201)
+        usage = BenefitUsage.objects.get(patient=self.patient, benefit_type=self.bt_consult)
+        self.assertEqual(float(usage.used_amount), 25.0)
+        self.assertEqual(usage.used_count, 1)
+        # moving the claim out of APPROVED releases the usage again
+        claim = Claim.objects.get(id=resp.data['id'])
+        claim.status = Claim.Status.PENDING
+        claim.save()
+        usage.refresh_from_db()
+        self.assertEqual(float(usage.used_amount), 0.0)
+        self.assertEqual(usage.used_count, 0)
+
+    def test_edited_approved_claim_moves_benefit_usage(self):
+        self.auth(self.provider)
+        resp = self.client.post('/api/claims/', {
+            'patient': self.patient.id,
+            'service_type': self.bt_consult.id,
+            'cost': '25.00'
+        }, format='json')
+        self.assertEqual(resp.status_code, 201)
+        claim = Claim.objects.get(id=resp.data['id'])
+        self.assertEqual(claim.status, Claim.Status.APPROVED)
+        # re-priced while staying APPROVED: the bucket carries the new cost, counted once
+        claim.cost = Decimal('40.00')
+        claim.save()
+        usage = BenefitUsage.objects.get(patient=self.patient, benefit_type=self.bt_consult)
+        self.assertEqual(usage.used_amount, Decimal('40.00'))
+        self.assertEqual(usage.used_count, 1)
+        # moved to another benefit: the old bucket empties and the new one picks it up
+        bt_lab, _ = BenefitType.objects.get_or_create(name='LAB')
+        SchemeBenefit.objects.create(
+            scheme=self.scheme,
+            benefit_type=bt_lab,
+            coverage_amount=100.0,
+            coverage_limit_count=5,
+            coverage_period=SchemeBenefit.CoveragePeriod.YEARLY,
+        )
+        claim.service_type = bt_lab
+        claim.save()
+        usage.refresh_from_db()
+        self.assertEqual(usage.used_amount, Decimal('0.00'))
+        self.assertEqual(usage.used_count, 0)
+        lab_usage = BenefitUsage.objects.get(patient=self.patient, benefit_type=bt_lab)
+        self.assertEqual(lab_usage.used_amount, Decimal('40.00'))
+        self.assertEqual(lab_usage.used_count, 1)
+
+    def test_cached_claim_detail_follows_patient_edits(self):
+        self.auth(self.provider)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post('/api/claims/', {
+                'patient': self.patient.id,
+                'service_type': self.bt_consult.id,
+                'cost': '15.00'
+            }, format='json')
+        url = f"/api/claims/{resp.data['id']}/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.phone = '0999000111'
+            self.patient.save()
+        self.assertEqual(self.client.get(url).data['patient_detail']['phone'], '0999000111')
+
+    def test_claim_list_summary_rows(self):
+        self.auth(self.provider)
+        self.client.post('/api/claims/', {
+            'patient': self.patient.id,
+            'service_type': self.bt_consult.id,
+            'cost': '15.00'
+        }, format='json')
+        resp = self.client.get('/api/claims/?summary=true')
+        self.assertEqual(resp.status_code, 200)
+        row = resp.data['results'][0]
+        self.assertEqual(row['patient_username'], 'pat')
+        self.assertEqual(row['service_type_name'], 'CONSULTATION')
+        self.assertEqual(row['cost'], '15.00')
+        self.assertNotIn('patient_detail', row)
+
+    def test_admin_can_revoke_preauth_approval(self):
+        preauth = PreAuthorizationRequest.objects.create(
+            patient=self.patient, provider=self.provider, service_type=self.bt_consult,
+            request_type=PreAuthorizationRequest.RequestType.OUTPATIENT, estimated_cost='80.00',
+            date_of_service='2030-01-01', diagnosis='dx', proposed_treatment='tx',
+            status=PreAuthorizationRequest.Status.APPROVED, approved_amount='80.00',
+        )
+        approval = PreAuthorizationApproval.objects.create(
+            preauth_request=preauth, approved_amount='80.00', approved_by=self.admin
+        )
+        self.auth(self.admin)
+        resp = self.client.post(f'/api/claims/preauth-approvals/{approval.id}/revoke/', {'reason': 'duplicate'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        preauth.refresh_from_db()
+        self.assertEqual(preauth.status, PreAuthorizationRequest.Status.CANCELLED)
+        self.assertIsNotNone(preauth.approval_expiry)
+        self.assertIn('[REVOKED] duplicate', preauth.approval_notes)
+        approval.refresh_from_db()
+        self.assertIn('[REVOKED] duplicate', approval.followup_notes)
+        # the request is no longer APPROVED, so a second revoke is refused
+        resp2 = self.client.post(f'/api/claims/preauth-approvals/{approval.id}/revoke/', {}, format='json')
+        self.assertEqual(resp2.status_code, 400)
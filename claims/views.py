@@ -1,23 +1,139 @@
+import json
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.utils import timezone
-from django.views.decorators.cache import cache_page
+from django.views.decorators.cache import cache_control, cache_page
+from django.views.decorators.vary import vary_on_headers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils.decorators import method_decorator
-from .models import Patient, Claim, Invoice
+from .models import Patient, Claim, Invoice, BenefitUsage
 from .models import PreAuthorizationRequest, PreAuthorizationApproval, PreAuthorizationRule, FraudAlert
 from .serializers import PatientSerializer, ClaimSerializer, InvoiceSerializer
 from .serializers import PreAuthorizationRequestSerializer, PreAuthorizationApprovalSerializer, PreAuthorizationRuleSerializer, FraudAlertSerializer
-from .services import validate_and_process_claim_enhanced, validate_and_process_claim_for_approval, emit_low_balance_alerts, emit_fraud_alert_if_needed
-from schemes.models import SchemeBenefit, BenefitType
+from .services import validate_and_process_claim_enhanced, validate_and_process_claim_for_approval
+from .services import PreAuthorizationService, get_benefit_usage, get_scheme_benefit, patient_responsibility
+from .tasks import queue_approved_claim_alerts
+from .notification_templates import CLAIM_APPROVED_HTML, CLAIM_APPROVED_RESPONSIBILITY_HTML, CLAIM_PARTIAL_APPROVAL_HTML, CLAIM_REJECTED_HTML
+from schemes.models import SchemeBenefit, BenefitType, MemberSubscription
 from core.models import MemberMessage, MemberDocument
 from accounts.notification_service import NotificationService
 from accounts.models_notifications import NotificationType
 from backend.pagination import OptimizedPagination
-from django.db.models import Sum
+from core.permissions import IsAdminOrProvider
+from core.cache import CacheManager, PREAUTH_RULES_LIST_KEY, fraud_alert_stats_key, serialized_object_key
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Prefetch, Q
 from django.utils import timezone as djtz
 from .services import _period_start
 
+logger = logging.getLogger(__name__)
+
+
+# Fields echoed back after reject/investigate; the client merges these into the
+# claim it already holds instead of receiving a full re-serialization.
+_CLAIM_ACK_FIELDS = ('id', 'status', 'coverage_checked', 'rejection_reason', 'rejection_date', 'processed_by_id')
+
+
+def _claim_ack(claim):
+	ack = {field: getattr(claim, field) for field in _CLAIM_ACK_FIELDS}
+	# Same key ClaimSerializer uses for the FK
+	ack['processed_by'] = ack.pop('processed_by_id')
+	return ack
+
+
+_FRAUD_ALERT_ACK_FIELDS = ('id', 'status', 'severity', 'reviewed_at', 'review_notes', 'resolution_action', 'reviewed_by_id')
+
+
+def _fraud_alert_ack(alert):
+	ack = {field: getattr(alert, field) for field in _FRAUD_ALERT_ACK_FIELDS}
+	ack['reviewed_by'] = ack.pop('reviewed_by_id')
+	return ack
+
+
+_APPROVAL_ACK_FIELDS = ('id', 'approval_type', 'approved_amount', 'followup_notes')
+
+
+def _approval_ack(approval):
+	ack = {field: getattr(approval, field) for field in _APPROVAL_ACK_FIELDS}
+	ack['request_status'] = approval.preauth_request.status
+	return ack
+
+
+# ?summary=true rows for the claims list: plain values() with the ClaimSerializer field names,
+# skipping the nested patient and the per-row fraud/pre-auth/subscription lookups
+CLAIM_SUMMARY_FIELDS = (
+	'id', 'patient', 'provider', 'service_type', 'cost', 'date_submitted', 'date_of_service',
+	'status', 'priority', 'coverage_checked', 'processed_date', 'preauth_number',
+)
+CLAIM_SUMMARY_RELATED = {
+	'patient_username': F('patient__user__username'),
+	'service_type_name': F('service_type__name'),
+	'provider_username': F('provider__username'),
+}
+
+
+def _stream_documents(rows):
+	storage = MemberDocument._meta.get_field('file').storage
+	yield '['
+	for index, row in enumerate(rows.iterator(chunk_size=500)):
+		row['file'] = storage.url(row['file']) if row['file'] else ''
+		yield (',' if index else '') + json.dumps(row, cls=DjangoJSONEncoder)
+	yield ']'
+
+
+def _own_columns(model, prefix=''):
+	return tuple(prefix + f.name for f in model._meta.concrete_fields)
+
+
+# Columns PatientSerializer/ClaimSerializer read. Each model keeps its own row; the
+# joined users, scheme and benefit type only load the few columns that are shown.
+_PATIENT_RELATED_COLUMNS = (
+	'user__username', 'user__first_name', 'user__last_name', 'user__email', 'user__date_joined',
+	'scheme__name',
+)
+PATIENT_DETAIL_FIELDS = _own_columns(Patient) + _PATIENT_RELATED_COLUMNS + (
+	'principal_member__user',
+	'principal_member__user__username',
+)
+CLAIM_DETAIL_FIELDS = _own_columns(Claim) + _own_columns(Patient, 'patient__') + tuple(
+	f'patient__{column}' for column in _PATIENT_RELATED_COLUMNS
+) + (
+	'provider__username',
+	'provider__provider_profile__user',
+	'provider__provider_profile__facility_name',
+	'service_type__name',
+	'processed_by__username',
+)
+
+
+# Columns the fraud alert list needs: the alert's own serialized fields plus the
+# two user lookups. Nested claim/patient payloads come from the viewset's prefetches,
+# limited to CLAIM_DETAIL_FIELDS / PATIENT_DETAIL_FIELDS.
+_FRAUD_ALERT_COLUMNS = {f.name for f in FraudAlert._meta.concrete_fields}
+FRAUD_ALERT_LIST_FIELDS = tuple(
+	f for f in FraudAlertSerializer.Meta.fields if f in _FRAUD_ALERT_COLUMNS
+) + (
+	'provider__username',
+	'provider__provider_profile__user',
+	'provider__provider_profile__facility_name',
+	'reviewed_by__username',
+)
+
+
+# Stats buckets, resolved from the choice enums once at import
+_ALERT_SEVERITIES = tuple(severity.value for severity in FraudAlert.Severity)
+_ALERT_TYPES = tuple(alert_type.value for alert_type in FraudAlert.AlertType)
+
+
+# Roles allowed to create or act on claims, pre-auth requests and member records
+_WRITE_ROLES = frozenset({'PROVIDER', 'ADMIN'})
+
 
 class IsProviderOrReadOnlyForAuthenticated(permissions.BasePermission):
 	def has_permission(self, request, view):
@@ -28,27 +144,83 @@ class IsProviderOrReadOnlyForAuthenticated(permissions.BasePermission):
 		if request.method in permissions.SAFE_METHODS:
 			return True
 		# Special-case viewset actions when available
-		action = getattr(view, 'action', None)
-		if action in ('list', 'retrieve'):
+		if getattr(view, 'action', None) in ('list', 'retrieve'):
 			return True
-		if action == 'validate':
-			return getattr(user, 'role', None) in ['PROVIDER', 'ADMIN']
-		# Writes require provider or admin
-		return getattr(user, 'role', None) in ['PROVIDER', 'ADMIN']
+		# Writes (and claim validation) require provider or admin
+		return user.role in _WRITE_ROLES
 
 
 class IsAdmin(permissions.BasePermission):
 	def has_permission(self, request, view):
-		return bool(request.user and request.user.is_authenticated and getattr(request.user, 'role', None) == 'ADMIN')
+		user = request.user
+		return bool(user and user.is_authenticated and user.role == 'ADMIN')
+
 
+class IsProviderForObjectOrAdmin(permissions.BasePermission):
+	"""Admins, or the provider a claim/pre-auth request was submitted to"""
+	message = 'Only admins or the provider this was submitted to can perform this action'
 
-class PatientViewSet(viewsets.ModelViewSet):
+	def has_permission(self, request, view):
+		user = request.user
+		return bool(user and user.is_authenticated and user.role in _WRITE_ROLES)
+
+	def has_object_permission(self, request, view, obj):
+		user = request.user
+		return user.role == 'ADMIN' or obj.provider_id == user.id
+
+
+class IsApproverOrAdmin(permissions.BasePermission):
+	"""Admins, or the user who granted the approval"""
+	message = 'Only admins or the original approver can revoke approvals'
+
+	def has_permission(self, request, view):
+		return bool(request.user and request.user.is_authenticated)
+
+	def has_object_permission(self, request, view, obj):
+		user = request.user
+		return user.role == 'ADMIN' or obj.approved_by_id == user.id
+
+
+class CachedRetrieveMixin:
+	"""Serve retrieve from a per-object cache of the serialized payload.
+
+	get_object() still runs, so queryset scoping and permissions apply on every hit.
+	core.cache drops the entry on commit when the object, or any row nested in its payload
+	(patient, subscription, pre-authorization, fraud alerts, the embedded claim), changes.
+	"""
+	@method_decorator(cache_control(private=True, max_age=300))
+	@method_decorator(vary_on_headers('Authorization'))
+	def retrieve(self, request, *args, **kwargs):
+		instance = self.get_object()
+		key = serialized_object_key(instance._meta.label_lower, instance.pk)
+		return Response(CacheManager.get_or_set(key, lambda: self.get_serializer(instance).data, timeout=300))
+
+
+class RoleScopedQuerySetMixin:
+	"""Limit get_queryset to the rows the requesting user's role may see.
+
+	role_scopes maps a role to the lookup tying a row to that user. Admins see
+	everything; any role without an entry sees nothing.
+	"""
+	role_scopes = {}
+
+	def get_queryset(self):
+		qs = super().get_queryset()
+		user = self.request.user
+		role = getattr(user, 'role', None)
+		if role == 'ADMIN':
+			return qs
+		lookup = self.role_scopes.get(role)
+		if lookup is None:
+			return qs.none()
+		return qs.filter(**{lookup: user})
+
+
+class PatientViewSet(CachedRetrieveMixin, viewsets.ModelViewSet):
 	queryset = Patient.objects.select_related(
 		'user',
 		'scheme',
-		'principal_member',
-		'member_subscription',
-		'member_subscription__tier'
+		'principal_member__user',
 	).prefetch_related(
 		'dependents'
 	).all()
@@ -58,15 +230,11 @@ class PatientViewSet(viewsets.ModelViewSet):
 	search_fields = ['user__username']
 	pagination_class = OptimizedPagination
 
-	def list(self, request, *args, **kwargs):
-		return super().list(request, *args, **kwargs)
-
-	def retrieve(self, request, *args, **kwargs):
-		return super().retrieve(request, *args, **kwargs)
-
 	def get_queryset(self):
 		user = self.request.user
 		qs = super().get_queryset()
+		if self.action in ('list', 'retrieve'):
+			qs = qs.only(*PATIENT_DETAIL_FIELDS)
 		role = getattr(user, 'role', None)
 		if role == 'PATIENT':
 			return qs.filter(user=user)
@@ -93,32 +261,32 @@ class PatientViewSet(viewsets.ModelViewSet):
 			is_active=True
 		).select_related('benefit_type')
 		
-		from django.db.models import Sum, Count, Q
-		from django.utils import timezone as djtz
-		from .services import _period_start
 		
 		data = []
 		current_time = djtz.now()
 		
-		# Get usage data for all benefit types in a single query
+		# Benefits share a handful of coverage periods; work out each period's start once
+		start_dates = {
+			period: _period_start(period, current_time, patient)
+			for period in {benefit.coverage_period for benefit in benefits}
+		}
+		
+		# All of the patient's current-period usage rows in one query
+		totals = {
+			(period_start, benefit_type_id): (used_amount, used_count)
+			for benefit_type_id, period_start, used_amount, used_count in BenefitUsage.objects.filter(
+				patient=patient,
+				period_start__in=set(start_dates.values()),
+			).values_list('benefit_type_id', 'period_start', 'used_amount', 'used_count')
+		}
+		
 		usage_data = {}
 		for benefit in benefits:
-			start_date = _period_start(benefit.coverage_period, current_time, patient)
-			
-			# Get approved claims for this benefit type within the period
-			claims_data = Claim.objects.filter(
-				patient=patient,
-				service_type=benefit.benefit_type,
-				status=Claim.Status.APPROVED,
-				date_submitted__gte=start_date,
-			).aggregate(
-				total_cost=Sum('cost'),
-				claim_count=Count('id')
-			)
-			
+			start_date = start_dates[benefit.coverage_period]
+			total_cost, claim_count = totals.get((start_date, benefit.benefit_type_id), (None, 0))
 			usage_data[benefit.id] = {
-				'used_amount': float(claims_data['total_cost'] or 0.0),
-				'used_count': claims_data['claim_count'] or 0,
+				'used_amount': float(total_cost or 0.0),
+				'used_count': claim_count,
 				'start_date': start_date
 			}
 		
@@ -153,21 +321,16 @@ class PatientViewSet(viewsets.ModelViewSet):
 	def messages(self, request, pk=None):
 		patient = self.get_object()
 		if request.method == 'GET':
-			qs = MemberMessage.objects.filter(patient=patient).order_by('-created_at')[:100]
-			return Response([
-				{
-					'id': m.id,
-					'subject': m.subject,
-					'body': m.body,
-					'direction': m.direction,
-					'sender': getattr(m.sender, 'username', None),
-					'created_at': m.created_at,
-					'read_at': m.read_at,
-				}
-				for m in qs
-			])
+			# values() joins the sender username in the same query instead of one lookup per message
+			rows = MemberMessage.objects.filter(patient=patient).order_by('-created_at').values(
+				'id', 'subject', 'body', 'direction', 'sender__username', 'created_at', 'read_at'
+			)[:100]
+			messages = list(rows)
+			for row in messages:
+				row['sender'] = row.pop('sender__username')
+			return Response(messages)
 		# POST - send a message to member
-		if getattr(request.user, 'role', None) not in ['ADMIN', 'PROVIDER']:
+		if request.user.role not in _WRITE_ROLES:
 			return Response({'detail': 'Only staff can message a member'}, status=status.HTTP_403_FORBIDDEN)
 		subject = request.data.get('subject', '')
 		body = request.data.get('message') or request.data.get('body')
@@ -206,17 +369,11 @@ class PatientViewSet(viewsets.ModelViewSet):
 	def documents(self, request, pk=None):
 		patient = self.get_object()
 		if request.method == 'GET':
-			qs = MemberDocument.objects.filter(patient=patient).order_by('-created_at')
-			return Response([
-				{
-					'id': d.id,
-					'doc_type': d.doc_type,
-					'notes': d.notes,
-					'file': getattr(d.file, 'url', ''),
-					'created_at': d.created_at,
-				}
-				for d in qs
-			])
+			rows = MemberDocument.objects.filter(patient=patient).order_by('-created_at').values(
+				'id', 'doc_type', 'notes', 'file', 'created_at'
+			)
+			# No cap on uploads per member, so stream the array instead of building it in memory
+			return StreamingHttpResponse(_stream_documents(rows), content_type='application/json')
 		# POST - upload a document (multipart/form-data)
 		file = request.FILES.get('document') or request.FILES.get('file')
 		if not file:
@@ -241,7 +398,6 @@ class PatientViewSet(viewsets.ModelViewSet):
 		current_dependents = patient.dependents.count()
 		
 		# Get subscription limits - first try to get active subscription
-		from billing.models import MemberSubscription
 		try:
 			subscription = MemberSubscription.objects.select_related('tier').get(
 				patient=patient,
@@ -288,7 +444,7 @@ class PatientViewSet(viewsets.ModelViewSet):
 		})
 
 
-class ClaimViewSet(viewsets.ModelViewSet):
+class ClaimViewSet(RoleScopedQuerySetMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
 	queryset = Claim.objects.select_related(
 		'patient__user',
 		'patient__scheme',
@@ -299,6 +455,7 @@ class ClaimViewSet(viewsets.ModelViewSet):
 	).all()  # Removed heavy prefetch_related for better pagination performance
 	serializer_class = ClaimSerializer
 	permission_classes = [IsProviderOrReadOnlyForAuthenticated]
+	role_scopes = {'PROVIDER': 'provider', 'PATIENT': 'patient__user'}
 	filterset_fields = {
 		'status': ['exact', 'in'],
 		'coverage_checked': ['exact'],
@@ -311,14 +468,24 @@ class ClaimViewSet(viewsets.ModelViewSet):
 	search_fields = ['service_type__name', 'patient__user__username', 'provider__username']
 	pagination_class = OptimizedPagination
 
+	# Vary on the bearer token so neither cache_page nor the browser shares a page across users
+	@method_decorator(cache_control(private=True, max_age=300))
 	@method_decorator(cache_page(300))  # Cache for 5 minutes
+	@method_decorator(vary_on_headers('Authorization'))
 	def list(self, request, *args, **kwargs):
-		return super().list(request, *args, **kwargs)
-
-	@method_decorator(cache_page(300))  # Cache for 5 minutes
-	def retrieve(self, request, *args, **kwargs):
-		return super().retrieve(request, *args, **kwargs)
-
+		if request.query_params.get('summary', 'false').lower() != 'true':
+			return super().list(request, *args, **kwargs)
+		rows = self.filter_queryset(self.get_queryset()).values(*CLAIM_SUMMARY_FIELDS, **CLAIM_SUMMARY_RELATED)
+		page = self.paginate_queryset(rows)
+		rows = list(rows) if page is None else page
+		for row in rows:
+			# Same "450.00" string ClaimSerializer renders for the DecimalField
+			row['cost'] = str(row['cost'])
+		if page is not None:
+			return self.get_paginated_response(rows)
+		return Response(rows)
+
+	@transaction.atomic
 	def perform_create(self, serializer):
 		claim = serializer.save(provider=self.request.user)
 		
@@ -336,26 +503,12 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			claim.save(update_fields=['status', 'coverage_checked', 'processed_date', 'processed_by'])
 			
 			# Get benefit data once for both invoice and alerts
-			try:
-				benefit = SchemeBenefit.objects.select_related('benefit_type').get(
-					scheme=claim.patient.scheme, 
-					benefit_type=claim.service_type
-				)
-			except SchemeBenefit.DoesNotExist:
-				benefit = None
+			benefit = get_scheme_benefit(claim.patient.scheme_id, claim.service_type_id)
 			
 			# Create invoice with detailed breakdown
-			from decimal import Decimal
 			if benefit:
 				# Calculate patient responsibility components
-				claim_amount = Decimal(str(claim.cost))
-				deductible = min(Decimal(str(benefit.deductible_amount or 0)), claim_amount)
-				after_deductible = claim_amount - deductible
-				
-				copay_fixed = Decimal(str(benefit.copayment_fixed or 0))
-				copay_percentage = Decimal(str(benefit.copayment_percentage or 0))
-				copay_percent_amount = after_deductible * (copay_percentage / 100)
-				total_copay = copay_fixed + copay_percent_amount
+				deductible, total_copay = patient_responsibility(benefit, claim.cost)
 				
 				Invoice.objects.create(
 					claim=claim, 
@@ -367,35 +520,8 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			else:
 				Invoice.objects.create(claim=claim, amount=payable)
 			
-			# emit alerts for low balance and fraud checks
-			if benefit and benefit.coverage_amount is not None:
-				# Get usage data efficiently
-				from django.db.models import Sum, Count
-				from .services import _period_start
-				from django.utils import timezone as djtz
-				
-				start_date = _period_start(benefit.coverage_period, djtz.now(), claim.patient)
-				usage_data = Claim.objects.filter(
-					patient=claim.patient,
-					service_type=claim.service_type,
-					status=Claim.Status.APPROVED,
-					date_submitted__gte=start_date,
-				).aggregate(
-					total_cost=Sum('cost'),
-					claim_count=Count('id')
-				)
-				
-				used_amount = float(usage_data['total_cost'] or 0.0)
-				remaining_after = float(benefit.coverage_amount) - used_amount
-				remaining_count = None
-				if benefit.coverage_limit_count is not None:
-					used_count = usage_data['claim_count'] or 0
-					remaining_count = max(benefit.coverage_limit_count - used_count, 0)
-				
-				# Try to get subscription for additional checks
-				subscription = getattr(claim.patient, 'member_subscription', None)
-				emit_low_balance_alerts(claim, benefit, subscription, remaining_after, remaining_count)
-			emit_fraud_alert_if_needed(claim)
+			# Low balance and fraud checks don't affect the response; run them in the background
+			queue_approved_claim_alerts(claim.id)
 		else:
 			# Check if the validation failure is due to missing pre-authorization
 			if "Pre-authorization required" in reason:
@@ -415,16 +541,10 @@ class ClaimViewSet(viewsets.ModelViewSet):
 		return response
 
 	def get_queryset(self):
-		user = self.request.user
 		qs = super().get_queryset()
-		role = getattr(user, 'role', None)
-		if role == 'ADMIN':
-			return qs
-		if role == 'PROVIDER':
-			return qs.filter(provider=user)
-		if role == 'PATIENT':
-			return qs.filter(patient__user=user)
-		return qs.none()
+		if self.action in ('list', 'retrieve'):
+			qs = qs.only(*CLAIM_DETAIL_FIELDS)
+		return qs
 
 	@action(detail=False, methods=['post'], url_path='validate')
 	def validate_claim(self, request):
@@ -452,113 +572,79 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			'validation_details': validation_details
 		})
 
-	@action(detail=True, methods=['post'], url_path='approve')
+	@action(detail=True, methods=['post'], url_path='approve', permission_classes=[IsProviderForObjectOrAdmin])
 	def approve_claim(self, request, pk=None):
 		"""Approve a claim - only providers and admins can do this"""
 		claim = self.get_object()
 		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions - only provider who received the claim or admin can approve
-		if role == 'PROVIDER' and claim.provider != user:
-			return Response({'detail': 'You can only approve claims submitted to you'}, status=status.HTTP_403_FORBIDDEN)
-		elif role not in ['PROVIDER', 'ADMIN']:
-			return Response({'detail': 'Only providers and admins can approve claims'}, status=status.HTTP_403_FORBIDDEN)
-		
-		# Check if claim can be approved
-		if claim.status not in [Claim.Status.PENDING, Claim.Status.INVESTIGATING, Claim.Status.REQUIRES_PREAUTH]:
-			return Response({'detail': f'Cannot approve claim with status: {claim.status}'}, status=status.HTTP_400_BAD_REQUEST)
-		
-		# Validate claim coverage before approval
-		approved, payable, reason, validation_details = validate_and_process_claim_for_approval(claim)
-		if not approved:
-			return Response({
-				'detail': 'Claim validation failed',
-				'reason': reason,
-				'approved': False,
-				'validation_details': validation_details
-			}, status=status.HTTP_400_BAD_REQUEST)
 		
-		# Approve the claim
-		from django.utils import timezone
-		claim.status = Claim.Status.APPROVED
-		claim.coverage_checked = True
-		claim.processed_date = timezone.now()
-		claim.processed_by = user
-		claim.save(update_fields=['status', 'coverage_checked', 'processed_date', 'processed_by'])
-		
-		# Update subscription usage tracking
-		subscription = getattr(claim.patient, 'member_subscription', None)
-		if subscription and subscription.is_active():
-			from decimal import Decimal
-			# Add the approved claim amount to the subscription's yearly usage
-			claim_amount = Decimal(str(claim.cost))
-			subscription.coverage_used_this_year = (subscription.coverage_used_this_year or Decimal('0.00')) + claim_amount
+		# Lock the claim row so two concurrent approvals can't both pass the status
+		# check; the claim, subscription and invoice writes commit together
+		with transaction.atomic():
+			claim.status = Claim.objects.select_for_update().values_list('status', flat=True).get(pk=claim.pk)
 			
-			# Increment monthly claims count
-			subscription.claims_this_month = (subscription.claims_this_month or 0) + 1
+			# Check if claim can be approved
+			if claim.status not in [Claim.Status.PENDING, Claim.Status.INVESTIGATING, Claim.Status.REQUIRES_PREAUTH]:
+				return Response({'detail': f'Cannot approve claim with status: {claim.status}'}, status=status.HTTP_400_BAD_REQUEST)
 			
-			# Save the updated subscription
-			subscription.save(update_fields=['coverage_used_this_year', 'claims_this_month'])
-		
-		# Create invoice if approved
-		from decimal import Decimal
-		try:
-			benefit = SchemeBenefit.objects.get(scheme=claim.patient.scheme, benefit_type=claim.service_type)
+			# Validate claim coverage before approval
+			approved, payable, reason, validation_details = validate_and_process_claim_for_approval(claim)
+			if not approved:
+				return Response({
+					'detail': 'Claim validation failed',
+					'reason': reason,
+					'approved': False,
+					'validation_details': validation_details
+				}, status=status.HTTP_400_BAD_REQUEST)
+			
+			# Approve the claim
+			claim.status = Claim.Status.APPROVED
+			claim.coverage_checked = True
+			claim.processed_date = timezone.now()
+			claim.processed_by = user
+			claim.save(update_fields=['status', 'coverage_checked', 'processed_date', 'processed_by'])
+			
+			# Update subscription usage tracking
+			subscription = getattr(claim.patient, 'member_subscription', None)
+			if subscription and subscription.is_active():
+				# Add the approved claim amount to the subscription's yearly usage
+				claim_amount = Decimal(str(claim.cost))
+				subscription.coverage_used_this_year = (subscription.coverage_used_this_year or Decimal('0.00')) + claim_amount
 			
-			# Calculate patient responsibility components
-			claim_amount = Decimal(str(claim.cost))
-			deductible = min(Decimal(str(benefit.deductible_amount or 0)), claim_amount)
-			after_deductible = claim_amount - deductible
+				# Increment monthly claims count
+				subscription.claims_this_month = (subscription.claims_this_month or 0) + 1
 			
-			copay_fixed = Decimal(str(benefit.copayment_fixed or 0))
-			copay_percentage = Decimal(str(benefit.copayment_percentage or 0))
-			copay_percent_amount = after_deductible * (copay_percentage / 100)
-			total_copay = copay_fixed + copay_percent_amount
+				# Save the updated subscription
+				subscription.save(update_fields=['coverage_used_this_year', 'claims_this_month'])
 			
-			invoice, created = Invoice.objects.get_or_create(
-				claim=claim,
-				defaults={
+			# Create invoice if approved
+			benefit = get_scheme_benefit(claim.patient.scheme_id, claim.service_type_id)
+			if benefit:
+				# Calculate patient responsibility components
+				deductible, total_copay = patient_responsibility(benefit, claim.cost)
+				invoice_fields = {
 					'amount': payable,
 					'patient_deductible': deductible,
 					'patient_copay': total_copay,
 					'patient_coinsurance': 0
 				}
-			)
-		except SchemeBenefit.DoesNotExist:
-			invoice, created = Invoice.objects.get_or_create(
-				claim=claim,
-				defaults={'amount': payable}
-			)
-		
-		# Emit alerts for low balance and fraud checks
-		try:
-			benefit = SchemeBenefit.objects.get(scheme=claim.patient.scheme, benefit_type=claim.service_type)
-		except SchemeBenefit.DoesNotExist:
-			benefit = None
-		if benefit and benefit.coverage_amount is not None:
-			from django.db.models import Sum
-			approved_qs = Claim.objects.filter(
-				patient=claim.patient,
-				service_type=claim.service_type,
-				status=Claim.Status.APPROVED,
-			)
-			used_amount = float(approved_qs.aggregate(total=Sum("cost"))['total'] or 0.0)
-			remaining_after = float(benefit.coverage_amount) - used_amount
-			remaining_count = None
-			if benefit.coverage_limit_count is not None:
-				remaining_count = max(benefit.coverage_limit_count - approved_qs.count(), 0)
+			else:
+				invoice_fields = {'amount': payable}
+			
+			# Claims rarely have an invoice yet, so insert directly; Invoice.claim is unique
+			try:
+				with transaction.atomic():
+					invoice = Invoice.objects.create(claim=claim, **invoice_fields)
+				created = True
+			except IntegrityError:
+				invoice = Invoice.objects.get(claim=claim)
+				created = False
+			
+			# Low balance and fraud checks don't affect the response; run them in the background
+			queue_approved_claim_alerts(claim.id)
 			
-			# Try to get subscription for additional checks
-			subscription = getattr(claim.patient, 'member_subscription', None)
-			emit_low_balance_alerts(claim, benefit, subscription, remaining_after, remaining_count)
-		emit_fraud_alert_if_needed(claim)
-		
 		# Send notification to provider about full approval
 		try:
-			from accounts.notification_service import NotificationService
-			from accounts.models_notifications import NotificationType
-			from decimal import Decimal
 			
 			# Get patient responsibility breakdown
 			deductible = Decimal(str(getattr(invoice, 'patient_deductible', 0)))
@@ -566,74 +652,25 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			coinsurance = Decimal(str(getattr(invoice, 'patient_coinsurance', 0)))
 			member_responsibility = deductible + copay + coinsurance
 			
-			html_message = f"""
-			<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-				<h2 style="color: #10b981; border-bottom: 2px solid #10b981; padding-bottom: 10px;">
-					✓ Claim Approved - Full Coverage
-				</h2>
-				
-				<div style="background-color: #f0fdf4; border-left: 4px solid #10b981; padding: 15px; margin: 20px 0;">
-					<p style="margin: 0; color: #15803d; font-weight: bold;">
-						The claim has been fully approved by the medical aid scheme.
-					</p>
-				</div>
-				
-				<h3 style="color: #374151; margin-top: 20px;">Claim Details</h3>
-				<table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
-					<tr style="background-color: #f9fafb;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Claim ID</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.id}</td>
-					</tr>
-					<tr>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Member ID</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.patient.member_id}</td>
-					</tr>
-					<tr style="background-color: #f9fafb;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Service Type</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.service_type.name}</td>
-					</tr>
-					<tr>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Date of Service</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.date_of_service}</td>
-					</tr>
-				</table>
-				
-				<h3 style="color: #374151; margin-top: 20px;">Payment Breakdown</h3>
-				<table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
-					<tr style="background-color: #f9fafb;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Total Claim Amount</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right;">R {claim.cost:,.2f}</td>
-					</tr>
-					<tr style="background-color: #e0f2fe;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Scheme Payment</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right; font-weight: bold; color: #0369a1;">R {payable:,.2f}</td>
-					</tr>
-					<tr>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Member Responsibility</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right;">R {member_responsibility:,.2f}</td>
-					</tr>
-				</table>
-				
-				{f'''
-				<div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0;">
-					<h4 style="margin-top: 0; color: #92400e;">Member Responsibility Details</h4>
-					<ul style="margin: 10px 0; padding-left: 20px;">
-						{f'<li>Deductible: R {deductible:,.2f}</li>' if deductible > 0 else ''}
-						{f'<li>Copayment: R {copay:,.2f}</li>' if copay > 0 else ''}
-						{f'<li>Coinsurance: R {coinsurance:,.2f}</li>' if coinsurance > 0 else ''}
-					</ul>
-					<p style="margin-bottom: 0; color: #92400e; font-weight: bold;">
-						Please collect R {member_responsibility:,.2f} from the member.
-					</p>
-				</div>
-				''' if member_responsibility > 0 else ''}
-				
-				<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e5e7eb; color: #6b7280; font-size: 0.875rem;">
-					<p>This is an automated notification from the Medical Aid Management System.</p>
-					<p>Approved by: {user.get_full_name() or user.username}</p>
-				</div>
-			</div>
-			"""
+			responsibility_items = ''.join(
+				f'<li>{label}: R {amount:,.2f}</li>'
+				for label, amount in (('Deductible', deductible), ('Copayment', copay), ('Coinsurance', coinsurance))
+				if amount > 0
+			)
+			html_message = CLAIM_APPROVED_HTML.render(
+				claim_id=claim.id,
+				member_id=claim.patient.member_id,
+				service_type=claim.service_type.name,
+				date_of_service=claim.date_of_service,
+				claim_amount=claim.cost,
+				scheme_payment=payable,
+				member_responsibility=member_responsibility,
+				responsibility_details=CLAIM_APPROVED_RESPONSIBILITY_HTML.render(
+					items=responsibility_items,
+					member_responsibility=member_responsibility,
+				) if member_responsibility > 0 else '',
+				approved_by=user.get_full_name() or user.username,
+			)
 			
 			NotificationService.create_notification(
 				recipient=claim.provider,
@@ -658,18 +695,16 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			)
 		except Exception as e:
 			# Log error but don't fail the approval
-			import logging
-			logger = logging.getLogger(__name__)
 			logger.error(f"Failed to send approval notification for claim {claim.id}: {str(e)}")
 		
 		serializer = self.get_serializer(claim)
 		return Response({
 			'detail': 'Claim approved successfully',
 			'claim': serializer.data,
-			'invoice_created': created if 'created' in locals() else False
+			'invoice_created': created
 		})
 
-	@action(detail=True, methods=['post'], url_path='approve-coverage-limit')
+	@action(detail=True, methods=['post'], url_path='approve-coverage-limit', permission_classes=[IsAdmin])
 	def approve_coverage_limit(self, request, pk=None):
 		"""Approve only up to the remaining coverage limit for this benefit (Admin only).
 
@@ -679,23 +714,14 @@ class ClaimViewSet(viewsets.ModelViewSet):
 		"""
 		claim = self.get_object()
 		user = request.user
-		role = getattr(user, 'role', None)
-
-		# Permissions: Admin only
-		if role != 'ADMIN':
-			return Response({'detail': 'Only administrators can approve up to coverage limit'}, status=status.HTTP_403_FORBIDDEN)
 
 		# Must be in a state that can be approved
 		if claim.status in [Claim.Status.APPROVED]:
 			return Response({'detail': 'Claim is already approved'}, status=status.HTTP_400_BAD_REQUEST)
 
 		# Get scheme benefit
-		try:
-			benefit = SchemeBenefit.objects.select_related('benefit_type').get(
-				scheme=claim.patient.scheme,
-				benefit_type=claim.service_type
-			)
-		except SchemeBenefit.DoesNotExist:
+		benefit = get_scheme_benefit(claim.patient.scheme_id, claim.service_type_id)
+		if benefit is None:
 			return Response({'detail': 'Benefit configuration not found for this claim'}, status=status.HTTP_400_BAD_REQUEST)
 
 		if benefit.coverage_amount is None:
@@ -704,28 +730,17 @@ class ClaimViewSet(viewsets.ModelViewSet):
 		# Calculate remaining coverage in current period
 		now = djtz.now()
 		period_start = _period_start(benefit.coverage_period, now, claim.patient)
-		used_amount = (
-			Claim.objects.filter(
-				patient=claim.patient,
-				service_type=claim.service_type,
-				status=Claim.Status.APPROVED,
-				date_submitted__gte=period_start,
-			)
-			.aggregate(total=Sum('cost'))['total'] or 0
-		)
-		remaining = float(benefit.coverage_amount) - float(used_amount)
-		remaining = max(remaining, 0.0)
+		used_amount, _ = get_benefit_usage(claim.patient_id, claim.service_type_id, period_start)
+		remaining = max(benefit.coverage_amount - used_amount, Decimal('0.00'))
 
 		if remaining <= 0:
 			return Response({'detail': 'Coverage limit already exhausted for this period'}, status=status.HTTP_400_BAD_REQUEST)
 
-		claim_amount = float(claim.cost)
+		claim_amount = claim.cost
 		approved_amount = min(remaining, claim_amount)
-		member_responsibility = max(claim_amount - approved_amount, 0.0)
+		member_responsibility = max(claim_amount - approved_amount, Decimal('0.00'))
 
 		# Approve the claim with the capped amount and create/update invoice
-		from decimal import Decimal
-		from django.utils import timezone
 
 		claim.status = Claim.Status.APPROVED
 		claim.coverage_checked = True
@@ -737,17 +752,17 @@ class ClaimViewSet(viewsets.ModelViewSet):
 		invoice, created = Invoice.objects.get_or_create(
 			claim=claim,
 			defaults={
-				'amount': Decimal(str(approved_amount)),
+				'amount': approved_amount,
 				# For this approval flow, treat the remainder as patient copay for clarity
 				'patient_deductible': Decimal('0.00'),
-				'patient_copay': Decimal(str(member_responsibility)),
+				'patient_copay': member_responsibility,
 				'patient_coinsurance': Decimal('0.00'),
 			}
 		)
 		if not created:
-			invoice.amount = Decimal(str(approved_amount))
+			invoice.amount = approved_amount
 			invoice.patient_deductible = Decimal('0.00')
-			invoice.patient_copay = Decimal(str(member_responsibility))
+			invoice.patient_copay = member_responsibility
 			invoice.patient_coinsurance = Decimal('0.00')
 			invoice.save(update_fields=['amount', 'patient_deductible', 'patient_copay', 'patient_coinsurance'])
 
@@ -763,58 +778,15 @@ class ClaimViewSet(viewsets.ModelViewSet):
 				f"The member is responsible for the difference. Please collect {member_responsibility:,.2f} from the member.\n"
 				f"Coverage period started: {period_start.date()}"
 			)
-			html_message = f"""
-			<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-				<h2 style="color: #059669;">Partial Claim Approval</h2>
-				<p>Your claim has been <strong>partially approved</strong> up to the remaining coverage limit.</p>
-				
-				<div style="background-color: #f0fdf4; border-left: 4px solid #059669; padding: 15px; margin: 20px 0;">
-					<h3 style="margin-top: 0; color: #047857;">Claim Details</h3>
-					<table style="width: 100%; border-collapse: collapse;">
-						<tr>
-							<td style="padding: 8px 0;"><strong>Claim ID:</strong></td>
-							<td style="padding: 8px 0;">{claim.id}</td>
-						</tr>
-						<tr>
-							<td style="padding: 8px 0;"><strong>Member ID:</strong></td>
-							<td style="padding: 8px 0;">{claim.patient.member_id}</td>
-						</tr>
-						<tr>
-							<td style="padding: 8px 0;"><strong>Service:</strong></td>
-							<td style="padding: 8px 0;">{claim.service_type.name}</td>
-						</tr>
-					</table>
-				</div>
-
-				<div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0;">
-					<h3 style="margin-top: 0; color: #d97706;">Payment Breakdown</h3>
-					<table style="width: 100%; border-collapse: collapse;">
-						<tr>
-							<td style="padding: 8px 0;"><strong>Total Claim Amount:</strong></td>
-							<td style="padding: 8px 0; text-align: right;">{claim_amount:,.2f}</td>
-						</tr>
-						<tr style="color: #059669;">
-							<td style="padding: 8px 0;"><strong>Approved Amount (Scheme):</strong></td>
-							<td style="padding: 8px 0; text-align: right; font-weight: bold;">{approved_amount:,.2f}</td>
-						</tr>
-						<tr style="color: #dc2626;">
-							<td style="padding: 8px 0;"><strong>Member Responsibility:</strong></td>
-							<td style="padding: 8px 0; text-align: right; font-weight: bold;">{member_responsibility:,.2f}</td>
-						</tr>
-					</table>
-				</div>
-
-				<div style="background-color: #fee2e2; border-left: 4px solid #dc2626; padding: 15px; margin: 20px 0;">
-					<h4 style="margin-top: 0; color: #991b1b;">⚠️ Action Required</h4>
-					<p style="margin-bottom: 0;">Please collect <strong>{member_responsibility:,.2f}</strong> from the member as their share of the claim cost.</p>
-				</div>
-
-				<p style="color: #6b7280; font-size: 12px; margin-top: 20px;">
-					Coverage period started: {period_start.date()}<br>
-					This approval is based on the remaining coverage limit for this benefit period.
-				</p>
-			</div>
-			"""
+			html_message = CLAIM_PARTIAL_APPROVAL_HTML.render(
+				claim_id=claim.id,
+				member_id=claim.patient.member_id,
+				service_type=claim.service_type.name,
+				claim_amount=claim_amount,
+				approved_amount=approved_amount,
+				member_responsibility=member_responsibility,
+				period_start=period_start.date(),
+			)
 			nsvc.create_notification(
 				recipient=claim.provider,
 				notification_type=NotificationType.CLAIM_STATUS_UPDATE,
@@ -827,17 +799,15 @@ class ClaimViewSet(viewsets.ModelViewSet):
 					'claim_id': claim.id,
 					'member_id': claim.patient.member_id,
 					'service_type': claim.service_type.name,
-					'claim_amount': float(claim_amount),
-					'approved_amount': float(approved_amount),
-					'member_responsibility': float(member_responsibility),
+					'claim_amount': claim_amount,
+					'approved_amount': approved_amount,
+					'member_responsibility': member_responsibility,
 					'coverage_period_start': str(period_start.date()),
 					'approval_type': 'PARTIAL_COVERAGE_LIMIT',
 				}
 			)
 		except Exception as e:
 			# Log error but do not fail the API if notification delivery fails
-			import logging
-			logger = logging.getLogger(__name__)
 			logger.error(f"Failed to send partial approval notification: {str(e)}")
 			pass
 
@@ -852,18 +822,11 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			'coverage_period_start': str(period_start.date()),
 		})
 
-	@action(detail=True, methods=['post'], url_path='reject')
+	@action(detail=True, methods=['post'], url_path='reject', permission_classes=[IsProviderForObjectOrAdmin])
 	def reject_claim(self, request, pk=None):
 		"""Reject a claim - only providers and admins can do this"""
 		claim = self.get_object()
 		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions - only provider who received the claim or admin can reject
-		if role == 'PROVIDER' and claim.provider != user:
-			return Response({'detail': 'You can only reject claims submitted to you'}, status=status.HTTP_403_FORBIDDEN)
-		elif role not in ['PROVIDER', 'ADMIN']:
-			return Response({'detail': 'Only providers and admins can reject claims'}, status=status.HTTP_403_FORBIDDEN)
 		
 		# Check if claim can be rejected
 		if claim.status in [Claim.Status.APPROVED, Claim.Status.REJECTED]:
@@ -873,7 +836,6 @@ class ClaimViewSet(viewsets.ModelViewSet):
 		rejection_reason = request.data.get('reason', 'No reason provided')
 		
 		# Reject the claim
-		from django.utils import timezone
 		claim.status = Claim.Status.REJECTED
 		claim.coverage_checked = True
 		claim.rejection_reason = rejection_reason
@@ -883,67 +845,16 @@ class ClaimViewSet(viewsets.ModelViewSet):
 		
 		# Send notification to provider about rejection
 		try:
-			from accounts.notification_service import NotificationService
-			from accounts.models_notifications import NotificationType
 			
-			html_message = f"""
-			<div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-				<h2 style="color: #dc2626; border-bottom: 2px solid #dc2626; padding-bottom: 10px;">
-					✗ Claim Rejected
-				</h2>
-				
-				<div style="background-color: #fef2f2; border-left: 4px solid #dc2626; padding: 15px; margin: 20px 0;">
-					<p style="margin: 0; color: #991b1b; font-weight: bold;">
-						This claim has been rejected by the medical aid scheme.
-					</p>
-				</div>
-				
-				<h3 style="color: #374151; margin-top: 20px;">Claim Details</h3>
-				<table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
-					<tr style="background-color: #f9fafb;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Claim ID</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.id}</td>
-					</tr>
-					<tr>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Member ID</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.patient.member_id}</td>
-					</tr>
-					<tr style="background-color: #f9fafb;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Service Type</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.service_type.name}</td>
-					</tr>
-					<tr>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Claim Amount</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb; text-align: right;">R {claim.cost:,.2f}</td>
-					</tr>
-					<tr style="background-color: #f9fafb;">
-						<td style="padding: 10px; border: 1px solid #e5e7eb; font-weight: bold;">Date of Service</td>
-						<td style="padding: 10px; border: 1px solid #e5e7eb;">{claim.date_of_service}</td>
-					</tr>
-				</table>
-				
-				<div style="background-color: #fee2e2; border-left: 4px solid #dc2626; padding: 15px; margin: 20px 0;">
-					<h4 style="margin-top: 0; color: #991b1b;">Rejection Reason</h4>
-					<p style="margin: 0; color: #7f1d1d;">
-						{rejection_reason}
-					</p>
-				</div>
-				
-				<div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0;">
-					<h4 style="margin-top: 0; color: #92400e;">Action Required</h4>
-					<p style="margin-bottom: 0; color: #92400e;">
-						• Inform the member that this claim was not approved<br>
-						• The member is responsible for the full amount of R {claim.cost:,.2f}<br>
-						• Review the rejection reason before resubmitting
-					</p>
-				</div>
-				
-				<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e5e7eb; color: #6b7280; font-size: 0.875rem;">
-					<p>This is an automated notification from the Medical Aid Management System.</p>
-					<p>Rejected by: {user.get_full_name() or user.username}</p>
-				</div>
-			</div>
-			"""
+			html_message = CLAIM_REJECTED_HTML.render(
+				claim_id=claim.id,
+				member_id=claim.patient.member_id,
+				service_type=claim.service_type.name,
+				claim_amount=claim.cost,
+				date_of_service=claim.date_of_service,
+				rejection_reason=rejection_reason,
+				rejected_by=user.get_full_name() or user.username,
+			)
 			
 			NotificationService.create_notification(
 				recipient=claim.provider,
@@ -964,91 +875,80 @@ class ClaimViewSet(viewsets.ModelViewSet):
 			)
 		except Exception as e:
 			# Log error but don't fail the rejection
-			import logging
-			logger = logging.getLogger(__name__)
 			logger.error(f"Failed to send rejection notification for claim {claim.id}: {str(e)}")
 		
-		serializer = self.get_serializer(claim)
-		return Response({
+		return JsonResponse({
 			'detail': 'Claim rejected successfully',
-			'claim': serializer.data
+			'claim': _claim_ack(claim)
 		})
 
-	@action(detail=True, methods=['post'], url_path='investigate')
+	@action(detail=True, methods=['post'], url_path='investigate', permission_classes=[IsProviderForObjectOrAdmin])
 	def investigate_claim(self, request, pk=None):
 		"""Mark claim for investigation - only providers and admins"""
 		claim = self.get_object()
-		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions
-		if role == 'PROVIDER' and claim.provider != user:
-			return Response({'detail': 'You can only investigate claims submitted to you'}, status=status.HTTP_403_FORBIDDEN)
-		elif role not in ['PROVIDER', 'ADMIN']:
-			return Response({'detail': 'Only providers and admins can investigate claims'}, status=status.HTTP_403_FORBIDDEN)
-		
-		# Check if claim can be investigated
-		if claim.status not in [Claim.Status.PENDING, Claim.Status.REQUIRES_PREAUTH]:
-			return Response({'detail': f'Cannot investigate claim with status: {claim.status}'}, status=status.HTTP_400_BAD_REQUEST)
-		
 		investigation_notes = request.data.get('notes', 'Under investigation')
 		
-		claim.status = Claim.Status.INVESTIGATING
-		claim.notes = f"{claim.notes}\n\n[Investigation] {investigation_notes}".strip()
-		claim.save(update_fields=['status', 'notes'])
+		# Notes are encrypted, so the append can't happen in SQL; lock the row so a
+		# concurrent writer can't drop this entry, or approve the claim, between our read and write
+		with transaction.atomic():
+			locked = Claim.objects.select_for_update().only('status', 'notes').get(pk=claim.pk)
+			
+			# Check if claim can be investigated
+			if locked.status not in [Claim.Status.PENDING, Claim.Status.REQUIRES_PREAUTH]:
+				return Response({'detail': f'Cannot investigate claim with status: {locked.status}'}, status=status.HTTP_400_BAD_REQUEST)
+			
+			claim.status = Claim.Status.INVESTIGATING
+			claim.notes = f"{locked.notes}\n\n[Investigation] {investigation_notes}".strip()
+			claim.save(update_fields=['status', 'notes'])
 		
-		serializer = self.get_serializer(claim)
-		return Response({
+		return JsonResponse({
 			'detail': 'Claim marked for investigation',
-			'claim': serializer.data
+			'claim': _claim_ack(claim)
 		})
 
 
-class InvoiceViewSet(viewsets.ModelViewSet):
+class InvoiceViewSet(RoleScopedQuerySetMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
 	queryset = Invoice.objects.select_related('claim', 'claim__patient__user', 'claim__provider').all()
 	serializer_class = InvoiceSerializer
 	permission_classes = [IsProviderOrReadOnlyForAuthenticated]
+	role_scopes = {'PROVIDER': 'claim__provider', 'PATIENT': 'claim__patient__user'}
 	filterset_fields = ['payment_status']
 	pagination_class = OptimizedPagination
 
+	# Vary on the bearer token so neither cache_page nor the browser shares a page across users
+	@method_decorator(cache_control(private=True, max_age=300))
 	@method_decorator(cache_page(300))  # Cache for 5 minutes
+	@method_decorator(vary_on_headers('Authorization'))
 	def list(self, request, *args, **kwargs):
 		return super().list(request, *args, **kwargs)
 
-	@method_decorator(cache_page(300))  # Cache for 5 minutes
-	def retrieve(self, request, *args, **kwargs):
-		return super().retrieve(request, *args, **kwargs)
-
-	def get_queryset(self):
-		user = self.request.user
-		qs = super().get_queryset()
-		role = getattr(user, 'role', None)
-		if role == 'ADMIN':
-			return qs
-		if role == 'PROVIDER':
-			return qs.filter(claim__provider=user)
-		if role == 'PATIENT':
-			return qs.filter(claim__patient__user=user)
-		return qs.none()
-
 	def update(self, request, *args, **kwargs):
-		if getattr(request.user, 'role', None) != 'ADMIN':
+		if request.user.role != 'ADMIN':
 			return Response({'detail': 'Admin only'}, status=status.HTTP_403_FORBIDDEN)
 		return super().update(request, *args, **kwargs)
 
 	def partial_update(self, request, *args, **kwargs):
-		if getattr(request.user, 'role', None) != 'ADMIN':
+		if request.user.role != 'ADMIN':
 			return Response({'detail': 'Admin only'}, status=status.HTTP_403_FORBIDDEN)
 		return super().partial_update(request, *args, **kwargs)
 
 
-class PreAuthorizationRuleViewSet(viewsets.ModelViewSet):
+class PreAuthorizationRuleViewSet(CachedRetrieveMixin, viewsets.ModelViewSet):
 	queryset = PreAuthorizationRule.objects.select_related('benefit_type', 'created_by', 'updated_by').all()
 	serializer_class = PreAuthorizationRuleSerializer
 	permission_classes = [IsAdmin]  # Only admins can manage rules
 	filterset_fields = ['benefit_type', 'rule_type', 'is_active', 'priority']
 	search_fields = ['name', 'description']
 
+	# Only the unfiltered first page is cached, under a fixed key core.cache drops on rule save/delete;
+	# filtered, searched and later pages go to the database
+	def list(self, request, *args, **kwargs):
+		if request.query_params:
+			return super().list(request, *args, **kwargs)
+		return Response(CacheManager.get_or_set(
+			PREAUTH_RULES_LIST_KEY, lambda: super(PreAuthorizationRuleViewSet, self).list(request, *args, **kwargs).data, timeout=600
+		))
+
 	def perform_create(self, serializer):
 		serializer.save(created_by=self.request.user, updated_by=self.request.user)
 
@@ -1056,13 +956,14 @@ class PreAuthorizationRuleViewSet(viewsets.ModelViewSet):
 		serializer.save(updated_by=self.request.user)
 
 
-class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
+class PreAuthorizationRequestViewSet(RoleScopedQuerySetMixin, viewsets.ModelViewSet):
 	queryset = PreAuthorizationRequest.objects.select_related(
 		'patient__user', 'provider', 'provider__provider_profile', 
 		'benefit_type', 'requested_by', 'reviewed_by'
 	).all()
 	serializer_class = PreAuthorizationRequestSerializer
 	permission_classes = [permissions.IsAuthenticated]
+	role_scopes = {'PROVIDER': 'provider', 'PATIENT': 'patient__user'}
 	filterset_fields = {
 		'status': ['exact', 'in'],
 		'urgency_level': ['exact', 'in'],
@@ -1075,23 +976,10 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 	}
 	search_fields = ['request_number', 'procedure_description', 'patient__user__username']
 
-	def get_queryset(self):
-		user = self.request.user
-		qs = super().get_queryset()
-		role = getattr(user, 'role', None)
-		if role == 'ADMIN':
-			return qs
-		if role == 'PROVIDER':
-			return qs.filter(provider=user)
-		if role == 'PATIENT':
-			return qs.filter(patient__user=user)
-		return qs.none()
-
 	def perform_create(self, serializer):
 		request_obj = serializer.save(requested_by=self.request.user)
 		
 		# Auto-process based on rules if possible
-		from .services import PreAuthorizationService
 		service = PreAuthorizationService()
 		auto_result = service.process_auto_approval(request_obj)
 		
@@ -1108,18 +996,11 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 				request_obj.rejection_reason = auto_result['rejection_reason']
 			request_obj.save()
 
-	@action(detail=True, methods=['post'], url_path='approve')
+	@action(detail=True, methods=['post'], url_path='approve', permission_classes=[IsProviderForObjectOrAdmin])
 	def approve_request(self, request, pk=None):
 		"""Approve a pre-authorization request"""
 		preauth_request = self.get_object()
 		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions
-		if role == 'PROVIDER' and preauth_request.provider != user:
-			return Response({'detail': 'You can only approve requests submitted to you'}, status=status.HTTP_403_FORBIDDEN)
-		elif role not in ['PROVIDER', 'ADMIN']:
-			return Response({'detail': 'Only providers and admins can approve requests'}, status=status.HTTP_403_FORBIDDEN)
 		
 		# Check if request can be approved
 		if preauth_request.status != PreAuthorizationRequest.Status.PENDING:
@@ -1134,7 +1015,6 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 			return Response({'detail': 'Approved amount is required'}, status=status.HTTP_400_BAD_REQUEST)
 		
 		# Approve the request
-		from django.utils import timezone
 		preauth_request.status = PreAuthorizationRequest.Status.APPROVED
 		preauth_request.approved_amount = approved_amount
 		preauth_request.approved_conditions = approved_conditions
@@ -1154,23 +1034,16 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 		)
 		
 		serializer = self.get_serializer(preauth_request)
-		return Response({
+		return JsonResponse({
 			'detail': 'Pre-authorization request approved successfully',
 			'request': serializer.data
 		})
 
-	@action(detail=True, methods=['post'], url_path='reject')
+	@action(detail=True, methods=['post'], url_path='reject', permission_classes=[IsProviderForObjectOrAdmin])
 	def reject_request(self, request, pk=None):
 		"""Reject a pre-authorization request"""
 		preauth_request = self.get_object()
 		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions
-		if role == 'PROVIDER' and preauth_request.provider != user:
-			return Response({'detail': 'You can only reject requests submitted to you'}, status=status.HTTP_403_FORBIDDEN)
-		elif role not in ['PROVIDER', 'ADMIN']:
-			return Response({'detail': 'Only providers and admins can reject requests'}, status=status.HTTP_403_FORBIDDEN)
 		
 		# Check if request can be rejected
 		if preauth_request.status != PreAuthorizationRequest.Status.PENDING:
@@ -1181,7 +1054,6 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 		review_notes = request.data.get('review_notes', '')
 		
 		# Reject the request
-		from django.utils import timezone
 		preauth_request.status = PreAuthorizationRequest.Status.REJECTED
 		preauth_request.rejection_reason = rejection_reason
 		preauth_request.review_notes = review_notes
@@ -1190,23 +1062,15 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 		preauth_request.save()
 		
 		serializer = self.get_serializer(preauth_request)
-		return Response({
+		return JsonResponse({
 			'detail': 'Pre-authorization request rejected successfully',
 			'request': serializer.data
 		})
 
-	@action(detail=True, methods=['post'], url_path='extend')
+	@action(detail=True, methods=['post'], url_path='extend', permission_classes=[IsProviderForObjectOrAdmin])
 	def extend_request(self, request, pk=None):
 		"""Extend expiry date of a pre-authorization request"""
 		preauth_request = self.get_object()
-		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions
-		if role == 'PROVIDER' and preauth_request.provider != user:
-			return Response({'detail': 'You can only extend requests submitted to you'}, status=status.HTTP_403_FORBIDDEN)
-		elif role not in ['PROVIDER', 'ADMIN']:
-			return Response({'detail': 'Only providers and admins can extend requests'}, status=status.HTTP_403_FORBIDDEN)
 		
 		# Check if request can be extended
 		if preauth_request.status not in [PreAuthorizationRequest.Status.PENDING, PreAuthorizationRequest.Status.APPROVED]:
@@ -1220,93 +1084,86 @@ class PreAuthorizationRequestViewSet(viewsets.ModelViewSet):
 			return Response({'detail': 'Valid number of days to extend is required'}, status=status.HTTP_400_BAD_REQUEST)
 		
 		# Extend the expiry date
-		from django.utils import timezone
-		from datetime import timedelta
-		current_expiry = preauth_request.expiry_date or timezone.now().date()
-		new_expiry = current_expiry + timedelta(days=days_to_extend)
-		
-		preauth_request.expiry_date = new_expiry
-		preauth_request.review_notes = f"{preauth_request.review_notes}\n\n[Extension] {extension_reason} - Extended by {days_to_extend} days".strip()
-		preauth_request.save(update_fields=['expiry_date', 'review_notes'])
+		with transaction.atomic():
+			locked = PreAuthorizationRequest.objects.select_for_update().get(pk=preauth_request.pk)
+			current_expiry = locked.approval_expiry or timezone.now().date()
+			preauth_request.approval_expiry = current_expiry + timedelta(days=days_to_extend)
+			preauth_request.approval_notes = f"{locked.approval_notes or ''}\n\n[Extension] {extension_reason} - Extended by {days_to_extend} days".strip()
+			preauth_request.save(update_fields=['approval_expiry', 'approval_notes'])
 		
 		serializer = self.get_serializer(preauth_request)
-		return Response({
+		return JsonResponse({
 			'detail': f'Pre-authorization request extended by {days_to_extend} days',
 			'request': serializer.data
 		})
 
 
-class PreAuthorizationApprovalViewSet(viewsets.ReadOnlyModelViewSet):
+class PreAuthorizationApprovalViewSet(RoleScopedQuerySetMixin, viewsets.ReadOnlyModelViewSet):
 	queryset = PreAuthorizationApproval.objects.select_related(
-		'request__patient__user', 'request__provider', 'benefit_type', 'approved_by'
+		'preauth_request__patient__user', 'preauth_request__provider', 'preauth_request__service_type', 'approved_by'
 	).all()
 	serializer_class = PreAuthorizationApprovalSerializer
 	permission_classes = [permissions.IsAuthenticated]
+	role_scopes = {'PROVIDER': 'preauth_request__provider', 'PATIENT': 'preauth_request__patient__user'}
 	filterset_fields = {
-		'request__patient': ['exact'],
-		'request__provider': ['exact'],
-		'benefit_type': ['exact'],
+		'preauth_request__patient': ['exact'],
+		'preauth_request__provider': ['exact'],
+		'preauth_request__service_type': ['exact'],
+		'preauth_request__status': ['exact'],
+		'approval_type': ['exact'],
 		'approved_date': ['gte', 'lte', 'date'],
-		'is_active': ['exact'],
 	}
-	search_fields = ['request__request_number', 'request__procedure_description']
+	search_fields = ['preauth_request__request_number', 'approval_reference']
 
-	def get_queryset(self):
-		user = self.request.user
-		qs = super().get_queryset()
-		role = getattr(user, 'role', None)
-		if role == 'ADMIN':
-			return qs
-		if role == 'PROVIDER':
-			return qs.filter(request__provider=user)
-		if role == 'PATIENT':
-			return qs.filter(request__patient__user=user)
-		return qs.none()
-
-	@action(detail=True, methods=['post'], url_path='revoke')
+	@action(detail=True, methods=['post'], url_path='revoke', permission_classes=[IsApproverOrAdmin])
 	def revoke_approval(self, request, pk=None):
 		"""Revoke a pre-authorization approval"""
 		approval = self.get_object()
-		user = request.user
-		role = getattr(user, 'role', None)
-		
-		# Check permissions - only admin or the approver can revoke
-		if role not in ['ADMIN'] and approval.approved_by != user:
-			return Response({'detail': 'Only admins or the original approver can revoke approvals'}, status=status.HTTP_403_FORBIDDEN)
-		
-		# Check if approval can be revoked
-		if not approval.is_active:
-			return Response({'detail': 'Approval is already inactive'}, status=status.HTTP_400_BAD_REQUEST)
 		
 		# Get revocation reason
 		revocation_reason = request.data.get('reason', 'Revoked by user')
+		note = f"[REVOKED] {revocation_reason}"
 		
-		# Revoke the approval
-		from django.utils import timezone
-		approval.is_active = False
-		approval.expires_at = timezone.now()
-		approval.approval_notes = f"{approval.approval_notes}\n\n[REVOKED] {revocation_reason}".strip()
-		approval.save()
-		
-		# Update the original request status
-		approval.request.status = PreAuthorizationRequest.Status.REVOKED
-		approval.request.review_notes = f"{approval.request.review_notes}\n\n[REVOKED] {revocation_reason}".strip()
-		approval.request.save()
+		with transaction.atomic():
+			locked_request = PreAuthorizationRequest.objects.select_for_update().get(pk=approval.preauth_request_id)
+			
+			# Check against the locked row so concurrent revokes can't both go through
+			if locked_request.status != PreAuthorizationRequest.Status.APPROVED:
+				return Response({'detail': f'Cannot revoke approval for request with status: {locked_request.status}'}, status=status.HTTP_400_BAD_REQUEST)
+			
+			# There is no REVOKED status; a revoked approval cancels the request and ends its validity today
+			locked_request.status = PreAuthorizationRequest.Status.CANCELLED
+			locked_request.approval_expiry = timezone.now().date()
+			locked_request.approval_notes = f"{locked_request.approval_notes or ''}\n\n{note}".strip()
+			locked_request.save(update_fields=['status', 'approval_expiry', 'approval_notes'])
+			
+			locked = PreAuthorizationApproval.objects.select_for_update().get(pk=approval.pk)
+			locked.followup_notes = f"{locked.followup_notes or ''}\n\n{note}".strip()
+			locked.save(update_fields=['followup_notes'])
+			locked.preauth_request = locked_request
 		
-		serializer = self.get_serializer(approval)
-		return Response({
+		return JsonResponse({
 			'detail': 'Pre-authorization approval revoked successfully',
-			'approval': serializer.data
+			'approval': _approval_ack(locked)
 		})
 
 
-class FraudAlertViewSet(viewsets.ModelViewSet):
+class FraudAlertViewSet(RoleScopedQuerySetMixin, viewsets.ModelViewSet):
+	# Alerts on a page mostly share a handful of claims and patients, so load those once
+	# each through prefetches (with the serializers' columns) instead of joining them per row
 	queryset = FraudAlert.objects.select_related(
-		'claim__patient__user', 'claim__provider', 'claim__provider__provider_profile',
-		'patient__user', 'provider', 'provider__provider_profile', 'reviewed_by'
-	).all()
+		'provider', 'provider__provider_profile', 'reviewed_by'
+	).prefetch_related(
+		Prefetch('claim', queryset=Claim.objects.select_related(
+			'patient__user', 'patient__scheme', 'provider', 'provider__provider_profile', 'service_type', 'processed_by'
+		).only(*CLAIM_DETAIL_FIELDS)),
+		Prefetch('patient', queryset=Patient.objects.select_related(
+			'user', 'scheme', 'principal_member__user'
+		).only(*PATIENT_DETAIL_FIELDS)),
+	)
 	serializer_class = FraudAlertSerializer
 	permission_classes = [permissions.IsAuthenticated]
+	role_scopes = {'PROVIDER': 'provider', 'PATIENT': 'patient__user'}
 	filterset_fields = {
 		'alert_type': ['exact', 'in'],
 		'severity': ['exact', 'in'],
@@ -1320,27 +1177,17 @@ class FraudAlertViewSet(viewsets.ModelViewSet):
 	search_fields = ['title', 'description', 'detection_rule']
 
 	def get_queryset(self):
-		user = self.request.user
 		qs = super().get_queryset()
-		role = getattr(user, 'role', None)
-		if role == 'ADMIN':
-			return qs
-		if role == 'PROVIDER':
-			return qs.filter(provider=user)
-		if role == 'PATIENT':
-			return qs.filter(patient__user=user)
-		return qs.none()
+		if self.action == 'list':
+			# List pages don't need every column of the joined user rows
+			qs = qs.only(*FRAUD_ALERT_LIST_FIELDS)
+		return qs
 
-	@action(detail=True, methods=['post'], url_path='review')
+	@action(detail=True, methods=['post'], url_path='review', permission_classes=[IsAdmin])
 	def review_alert(self, request, pk=None):
 		"""Review and resolve a fraud alert"""
 		alert = self.get_object()
 		user = request.user
-		role = getattr(user, 'role', None)
-
-		# Check permissions - only admin can review alerts
-		if role not in ['ADMIN']:
-			return Response({'detail': 'Only administrators can review fraud alerts'}, status=status.HTTP_403_FORBIDDEN)
 
 		# Get review data
 		action = request.data.get('action', 'REVIEWED')  # REVIEWED, DISMISSED, ESCALATED
@@ -1356,44 +1203,62 @@ class FraudAlertViewSet(viewsets.ModelViewSet):
 		else:
 			return Response({'detail': 'Invalid action. Must be REVIEWED, DISMISSED, or ESCALATED'}, status=status.HTTP_400_BAD_REQUEST)
 
-		serializer = self.get_serializer(alert)
-		return Response({
+		return JsonResponse({
 			'detail': f'Fraud alert {action.lower()} successfully',
-			'alert': serializer.data
+			'alert': _fraud_alert_ack(alert)
 		})
 
-	@action(detail=False, methods=['get'], url_path='stats')
+	@action(detail=False, methods=['get'], url_path='stats', permission_classes=[IsAdminOrProvider])
 	def get_alert_stats(self, request):
 		"""Get fraud alert statistics"""
 		user = request.user
-		role = getattr(user, 'role', None)
 
 		# Base queryset
-		if role == 'ADMIN':
+		if user.role == 'ADMIN':
 			qs = FraudAlert.objects.all()
-		elif role == 'PROVIDER':
-			qs = FraudAlert.objects.filter(provider=user)
+			key = fraud_alert_stats_key()
 		else:
-			return Response({'detail': 'Insufficient permissions'}, status=status.HTTP_403_FORBIDDEN)
+			qs = FraudAlert.objects.filter(provider=user)
+			key = fraud_alert_stats_key(user.pk)
+
+		# Dashboards poll this; core.cache drops the entry whenever an alert is saved or deleted
+		return Response(CacheManager.get_or_set(key, lambda: self._alert_stats(qs), timeout=60))
+
+	def _alert_stats(self, qs):
+		# One pass over the table for every status/severity bucket, one grouped query for types
+		counts = qs.aggregate(
+			total_alerts=Count('id'),
+			active_alerts=Count('id', filter=Q(status=FraudAlert.Status.ACTIVE)),
+			reviewed_alerts=Count('id', filter=Q(status=FraudAlert.Status.REVIEWED)),
+			dismissed_alerts=Count('id', filter=Q(status=FraudAlert.Status.DISMISSED)),
+			escalated_alerts=Count('id', filter=Q(status=FraudAlert.Status.ESCALATED)),
+			high_risk_alerts=Count('id', filter=Q(fraud_score__gte=0.8)),
+			**{
+				f'severity_{severity}': Count('id', filter=Q(severity=severity))
+				for severity in _ALERT_SEVERITIES
+			},
+		)
+		type_counts = dict(qs.order_by().values_list('alert_type').annotate(n=Count('id')))
 
-		# Calculate statistics
 		stats = {
-			'total_alerts': qs.count(),
-			'active_alerts': qs.filter(status=FraudAlert.Status.ACTIVE).count(),
-			'reviewed_alerts': qs.filter(status=FraudAlert.Status.REVIEWED).count(),
-			'dismissed_alerts': qs.filter(status=FraudAlert.Status.DISMISSED).count(),
-			'escalated_alerts': qs.filter(status=FraudAlert.Status.ESCALATED).count(),
+			'total_alerts': counts['total_alerts'],
+			'active_alerts': counts['active_alerts'],
+			'reviewed_alerts': counts['reviewed_alerts'],
+			'dismissed_alerts': counts['dismissed_alerts'],
+			'escalated_alerts': counts['escalated_alerts'],
 			'by_severity': {
-				'LOW': qs.filter(severity=FraudAlert.Severity.LOW).count(),
-				'MEDIUM': qs.filter(severity=FraudAlert.Severity.MEDIUM).count(),
-				'HIGH': qs.filter(severity=FraudAlert.Severity.HIGH).count(),
-				'CRITICAL': qs.filter(severity=FraudAlert.Severity.CRITICAL).count(),
+				severity: counts[f'severity_{severity}']
+				for severity in _ALERT_SEVERITIES
 			},
 			'by_type': {
-				alert_type.value: qs.filter(alert_type=alert_type).count()
-				for alert_type in FraudAlert.AlertType
+				alert_type: type_counts.get(alert_type, 0)
+				for alert_type in _ALERT_TYPES
 			},
-			'high_risk_alerts': qs.filter(fraud_score__gte=0.8).count(),
+			'high_risk_alerts': counts['high_risk_alerts'],
+			# Kept for callers that only need "are there any?"
+			'active_alerts_exists': counts['active_alerts'] > 0,
+			'escalated_alerts_exists': counts['escalated_alerts'] > 0,
+			'high_risk_alerts_exists': counts['high_risk_alerts'] > 0,
 		}
 
-		return Response(stats)
+		return stats
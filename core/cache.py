@@ -2,10 +2,46 @@ from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
+from django.db import transaction
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+PREAUTH_RULES_CACHE_PREFIX = 'preauth_rules'
+PREAUTH_RULES_ACTIVE_KEY = f'{PREAUTH_RULES_CACHE_PREFIX}:active'
+PREAUTH_RULES_LIST_KEY = f'{PREAUTH_RULES_CACHE_PREFIX}:list'
+SCHEME_BENEFIT_KEY = 'scheme_benefit:{scheme_id}:{benefit_type_id}'
+SERIALIZED_OBJECT_KEY = 'serialized:{label}:{pk}'
+FRAUD_ALERT_STATS_KEY = 'fraud_alert_stats:{scope}'
+EDI_VALIDATION_RULES_KEY = 'edi_validation_rules_active'
+
+_pending_deletes = threading.local()
+
+
+def delete_on_commit(*keys):
+    """
+    Delete cache keys once the current transaction commits.
+
+    Keys queued by every save in one transaction go out in a single delete_many, so
+    bulk writes cost one cache round trip rather than one per row, and readers can't
+    re-cache the old rows before the new ones are visible. Outside a transaction
+    the delete happens immediately.
+    """
+    pending = getattr(_pending_deletes, 'keys', None)
+    if pending is None:
+        pending = _pending_deletes.keys = set()
+    pending.update(keys)
+    transaction.on_commit(_flush_pending_deletes)
+
+
+def _flush_pending_deletes():
+    keys = getattr(_pending_deletes, 'keys', None)
+    if keys:
+        _pending_deletes.keys = set()
+        cache.delete_many(list(keys))
+
+
 def invalidate_cache_pattern(pattern):
     """
     Invalidate cache keys matching a pattern
@@ -27,11 +63,11 @@ def invalidate_cache_pattern(pattern):
                 'cache_stats'
             ]
 
-            for key in known_keys:
-                cache.delete(key)
+            cache.delete_many(known_keys)
 
-            # Also clear system settings cache
-            cache.delete_pattern('system_setting_*')
+            # Also clear system settings cache (pattern deletion is django-redis only)
+            if hasattr(cache, 'delete_pattern'):
+                cache.delete_pattern('system_setting_*')
 
             logger.info(f"Cache keys invalidated for pattern: {pattern}")
 
@@ -42,28 +78,28 @@ def invalidate_cache_pattern(pattern):
 @receiver(post_save, sender='schemes.BenefitType')
 def invalidate_benefit_type_cache(sender, instance, **kwargs):
     """Invalidate benefit types cache when BenefitType is modified"""
-    cache.delete('benefit_types')
+    delete_on_commit('benefit_types')
     logger.info("Benefit types cache invalidated")
 
 
 @receiver(post_delete, sender='schemes.BenefitType')
 def invalidate_benefit_type_cache_on_delete(sender, instance, **kwargs):
     """Invalidate benefit types cache when BenefitType is deleted"""
-    cache.delete('benefit_types')
+    delete_on_commit('benefit_types')
     logger.info("Benefit types cache invalidated (delete)")
 
 
 @receiver(post_save, sender='schemes.SubscriptionTier')
 def invalidate_subscription_tier_cache(sender, instance, **kwargs):
     """Invalidate subscription tiers cache when SubscriptionTier is modified"""
-    cache.delete('subscription_tiers')
+    delete_on_commit('subscription_tiers')
     logger.info("Subscription tiers cache invalidated")
 
 
 @receiver(post_delete, sender='schemes.SubscriptionTier')
 def invalidate_subscription_tier_cache_on_delete(sender, instance, **kwargs):
     """Invalidate subscription tiers cache when SubscriptionTier is deleted"""
-    cache.delete('subscription_tiers')
+    delete_on_commit('subscription_tiers')
     logger.info("Subscription tiers cache invalidated (delete)")
 
 
@@ -71,7 +107,7 @@ def invalidate_subscription_tier_cache_on_delete(sender, instance, **kwargs):
 def invalidate_system_settings_cache(sender, instance, **kwargs):
     """Invalidate system settings cache when SystemSettings is modified"""
     cache_key = f"system_setting_{instance.key}"
-    cache.delete(cache_key)
+    delete_on_commit(cache_key)
     logger.info(f"System setting cache invalidated: {instance.key}")
 
 
@@ -79,10 +115,131 @@ def invalidate_system_settings_cache(sender, instance, **kwargs):
 def invalidate_system_settings_cache_on_delete(sender, instance, **kwargs):
     """Invalidate system settings cache when SystemSettings is deleted"""
     cache_key = f"system_setting_{instance.key}"
-    cache.delete(cache_key)
+    delete_on_commit(cache_key)
     logger.info(f"System setting cache invalidated (delete): {instance.key}")
 
 
+@receiver(post_save, sender='schemes.SchemeBenefit')
+def invalidate_scheme_benefit_cache(sender, instance, **kwargs):
+    """Invalidate cached scheme benefit lookup when SchemeBenefit is modified"""
+    delete_on_commit(SCHEME_BENEFIT_KEY.format(scheme_id=instance.scheme_id, benefit_type_id=instance.benefit_type_id))
+    logger.info(f"Scheme benefit cache invalidated: {instance.scheme_id}/{instance.benefit_type_id}")
+
+
+@receiver(post_delete, sender='schemes.SchemeBenefit')
+def invalidate_scheme_benefit_cache_on_delete(sender, instance, **kwargs):
+    """Invalidate cached scheme benefit lookup when SchemeBenefit is deleted"""
+    delete_on_commit(SCHEME_BENEFIT_KEY.format(scheme_id=instance.scheme_id, benefit_type_id=instance.benefit_type_id))
+    logger.info(f"Scheme benefit cache invalidated (delete): {instance.scheme_id}/{instance.benefit_type_id}")
+
+
+def serialized_object_key(label, pk):
+    """Cache key for an object's serialized API payload, e.g. ('claims.claim', 12)"""
+    return SERIALIZED_OBJECT_KEY.format(label=label, pk=pk)
+
+
+def _claim_payload_keys(**lookup):
+    """
+    Serialized keys of the claims matching lookup and of their invoices, which embed the claim.
+    Used when data nested in claim payloads (patient, subscription, pre-auth, fraud alerts) changes.
+    """
+    from claims.models import Claim
+    keys = []
+    for claim_id, invoice_id in Claim.objects.filter(**lookup).values_list('pk', 'invoice__pk'):
+        keys.append(serialized_object_key('claims.claim', claim_id))
+        if invoice_id is not None:
+            keys.append(serialized_object_key('claims.invoice', invoice_id))
+    return keys
+
+
+@receiver([post_save, post_delete], sender='claims.Patient')
+def invalidate_serialized_patient(sender, instance, **kwargs):
+    """Drop a patient's cached detail payload, and those of its claims (patient_detail), when it changes"""
+    delete_on_commit(
+        serialized_object_key('claims.patient', instance.pk),
+        *_claim_payload_keys(patient_id=instance.pk),
+    )
+
+
+@receiver([post_save, post_delete], sender='claims.Claim')
+def invalidate_serialized_claim(sender, instance, **kwargs):
+    """Drop a claim's cached detail payload, its patient's (last claim date) and its invoice's (claim_details)"""
+    keys = [
+        serialized_object_key('claims.claim', instance.pk),
+        serialized_object_key('claims.patient', instance.patient_id),
+    ]
+    # A deleted claim takes its invoice with it, and the invoice's own receiver drops that key
+    if kwargs['signal'] is post_save:
+        keys.extend(_claim_payload_keys(pk=instance.pk))
+    delete_on_commit(*keys)
+
+
+@receiver([post_save, post_delete], sender='schemes.MemberSubscription')
+def invalidate_serialized_patient_subscription(sender, instance, **kwargs):
+    """Patient payloads embed their member subscription, claim payloads its subscription_context"""
+    delete_on_commit(
+        serialized_object_key('claims.patient', instance.patient_id),
+        *_claim_payload_keys(patient_id=instance.patient_id),
+    )
+
+
+@receiver([post_save, post_delete], sender='claims.PreAuthorizationRequest')
+def invalidate_serialized_preauth_claims(sender, instance, **kwargs):
+    """Claim payloads carrying this request's number embed its pre_auth_status"""
+    if instance.request_number:
+        delete_on_commit(*_claim_payload_keys(preauth_number=instance.request_number))
+
+
+@receiver([post_save, post_delete], sender='claims.PreAuthorizationApproval')
+def invalidate_serialized_approval_claims(sender, instance, **kwargs):
+    """pre_auth_status also reflects the request's approval"""
+    from claims.models import PreAuthorizationRequest
+    delete_on_commit(*_claim_payload_keys(
+        preauth_number__in=PreAuthorizationRequest.objects.filter(pk=instance.preauth_request_id).values('request_number')
+    ))
+
+
+@receiver([post_save, post_delete], sender='claims.Invoice')
+def invalidate_serialized_invoice(sender, instance, **kwargs):
+    """Drop an invoice's cached detail payload when it changes"""
+    delete_on_commit(serialized_object_key('claims.invoice', instance.pk))
+
+
+@receiver([post_save, post_delete], sender='claims.FraudAlert')
+def invalidate_serialized_claim_alerts(sender, instance, **kwargs):
+    """Claim payloads embed their fraud alerts"""
+    delete_on_commit(*_claim_payload_keys(pk=instance.claim_id))
+
+
+def fraud_alert_stats_key(provider_id=None):
+    """Cache key for the fraud alert stats of one provider, or of all alerts when None"""
+    return FRAUD_ALERT_STATS_KEY.format(scope='all' if provider_id is None else f'provider:{provider_id}')
+
+
+@receiver([post_save, post_delete], sender='claims.FraudAlert')
+def invalidate_fraud_alert_stats(sender, instance, **kwargs):
+    """Drop the admin-wide stats and those of the alert's provider"""
+    delete_on_commit(fraud_alert_stats_key(), fraud_alert_stats_key(instance.provider_id))
+
+
+@receiver([post_save, post_delete], sender='claims.PreAuthorizationRule')
+def invalidate_preauth_rules_cache(sender, instance, **kwargs):
+    """Drop the active rule list, the unfiltered rule API list and the rule's detail payload"""
+    delete_on_commit(
+        PREAUTH_RULES_ACTIVE_KEY,
+        PREAUTH_RULES_LIST_KEY,
+        serialized_object_key('claims.preauthorizationrule', instance.pk),
+    )
+    logger.info("Pre-authorization rules cache invalidated")
+
+
+@receiver([post_save, post_delete], sender='core.EDIValidationRule')
+def invalidate_edi_validation_rules_cache(sender, instance, **kwargs):
+    """Drop the cached active EDI validation rules when a rule changes"""
+    delete_on_commit(EDI_VALIDATION_RULES_KEY)
+    logger.info("EDI validation rules cache invalidated")
+
+
 def invalidate_user_cache(user_id):
     """Invalidate user-specific cache entries"""
     try:
@@ -92,8 +249,7 @@ def invalidate_user_cache(user_id):
             f"user_{user_id}_claims"
         ]
 
-        for key in cache_keys:
-            cache.delete(key)
+        cache.delete_many(cache_keys)
 
         logger.info(f"User cache invalidated for user {user_id}")
     except Exception as e:
@@ -121,8 +277,7 @@ def invalidate_claim_cache(claim_id=None, patient_id=None):
         cache_keys.append('recent_claims')
         cache_keys.append('claims_summary')
 
-        for key in cache_keys:
-            cache.delete(key)
+        cache.delete_many(cache_keys)
 
         logger.info(f"Claim cache invalidated: claim_id={claim_id}, patient_id={patient_id}")
     except Exception as e:
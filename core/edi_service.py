@@ -5,15 +5,54 @@ Handles X12 parsing, validation, and processing for medical aid claims and payme
 
 import re
 import uuid
+from collections import defaultdict
+from itertools import zip_longest
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from decimal import Decimal
 
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction as db_transaction
 
+from .cache import CacheManager, EDI_VALIDATION_RULES_KEY
 from .models import EDITransaction, EDIValidationRule
 
+# Fallback segment splitter for content too short to hold a fixed-width ISA header
+_LINE_SPLIT_RE = re.compile(r'[\r\n]+')
+# ISA is fixed width: element separator at 3, component separator at 104, segment terminator at 105
+ISA_LENGTH = 106
+ISA_ELEMENT_COUNT = 16
+
+# Envelope segment element names, in element order
+ISA_FIELDS = (
+	'authorization_qualifier', 'authorization_info', 'security_qualifier', 'security_info',
+	'sender_qualifier', 'sender_id', 'receiver_qualifier', 'receiver_id', 'date', 'time',
+	'control_standards_id', 'control_version', 'control_number', 'acknowledgment_requested',
+	'usage_indicator',
+)
+GS_FIELDS = (
+	'functional_id', 'application_sender', 'application_receiver', 'date', 'time',
+	'control_number', 'responsible_agency', 'version',
+)
+ST_FIELDS = ('transaction_set_id', 'transaction_set_control_number')
+SE_FIELDS = ('segment_count', 'transaction_set_control_number')
+GE_FIELDS = ('transaction_count', 'control_number')
+IEA_FIELDS = ('functional_group_count', 'control_number')
+
+
+def _segment_fields(names, elements) -> Dict[str, Any]:
+	"""Map an envelope segment's elements onto names, '' for any that are missing"""
+	return dict(zip_longest(names, elements[:len(names)], fillvalue=''))
+
+
+def _has_fixed_width_isa(content: str) -> bool:
+	"""Whether content opens with a padded ISA, whose 16 elements put the separators at fixed positions"""
+	if len(content) < ISA_LENGTH:
+		return False
+	separator = content[3]
+	return content[103] == separator and content[:ISA_LENGTH].count(separator) == ISA_ELEMENT_COUNT
+
 
 class X12Parser:
 	"""Parser for X12 EDI format healthcare transactions"""
@@ -23,56 +62,112 @@ class X12Parser:
 		self.segments = []
 		self.parsed_data = {}
 		self.errors = []
+		self.element_separator = '*'
+		self.component_separator = ':'
 
 	def parse(self) -> Dict[str, Any]:
-		"""Parse X12 content into structured data"""
+		"""Parse X12 content into structured data in a single pass over the segments"""
 		try:
+			# Every interchange opens with ISA; reject anything else before splitting it
+			if not self.x12_content or not self.x12_content.strip():
+				self.errors.append("No segments found in X12 content")
+				return {}
+			if not self.x12_content.lstrip().startswith('ISA'):
+				self.errors.append("X12 content must start with an ISA interchange header")
+				return {}
+
 			# Split into segments and clean up
-			raw_segments = [seg.strip() for seg in re.split(r'[\r\n]+', self.x12_content) if seg.strip()]
+			raw_segments = self._split_segments(self.x12_content)
 
 			if not raw_segments:
 				self.errors.append("No segments found in X12 content")
 				return {}
 
-			# Parse each segment
-			for segment in raw_segments:
-				parsed_segment = self._parse_segment(segment)
-				if parsed_segment:
-					self.segments.append(parsed_segment)
+			hierarchy = {
+				'interchange': {},
+				'functional_groups': [],
+				'transactions': []
+			}
+			current_group = None
+			current_transaction = None
+
+			for raw in raw_segments:
+				segment = self._parse_segment(raw)
+				if not segment:
+					continue
+				self.segments.append(segment)
+				segment_id = segment['segment_id']
+				elements = segment['elements']
+
+				if segment_id == 'ISA':
+					# Interchange Control Header
+					hierarchy['interchange'] = _segment_fields(ISA_FIELDS, elements)
+				elif segment_id == 'GS':
+					# Functional Group Header
+					current_group = _segment_fields(GS_FIELDS, elements)
+					current_group['transactions'] = []
+					hierarchy['functional_groups'].append(current_group)
+				elif segment_id == 'ST':
+					# Transaction Set Header
+					current_transaction = _segment_fields(ST_FIELDS, elements)
+					current_transaction['segments'] = []
+					if current_group:
+						current_group['transactions'].append(current_transaction)
+					else:
+						hierarchy['transactions'].append(current_transaction)
+				elif segment_id == 'SE':
+					# Transaction Set Trailer
+					if current_transaction:
+						current_transaction['trailer'] = _segment_fields(SE_FIELDS, elements)
+				elif segment_id == 'GE':
+					# Functional Group Trailer
+					if current_group:
+						current_group['trailer'] = _segment_fields(GE_FIELDS, elements)
+				elif segment_id == 'IEA':
+					# Interchange Control Trailer
+					hierarchy['interchange']['trailer'] = _segment_fields(IEA_FIELDS, elements)
+				elif current_transaction:
+					# Transaction data segments
+					current_transaction['segments'].append(segment)
 
 			# Validate basic structure
 			if not self.segments:
 				self.errors.append("No valid segments parsed")
 				return {}
 
-			# Build hierarchical structure
-			self.parsed_data = self._build_hierarchy()
+			self.parsed_data = hierarchy
 			return self.parsed_data
 
 		except Exception as e:
 			self.errors.append(f"Parse error: {str(e)}")
 			return {}
 
+	def _split_segments(self, content: str) -> List[str]:
+		"""Split content on the separators declared in a fixed-width ISA header, or on line breaks without one"""
+		content = content.lstrip()
+		if _has_fixed_width_isa(content):
+			self.element_separator = content[3]
+			self.component_separator = content[104]
+			segments = content.split(content[105])
+		else:
+			segments = _LINE_SPLIT_RE.split(content)
+		return [seg.strip() for seg in segments if seg.strip()]
+
 	def _parse_segment(self, segment: str) -> Optional[Dict[str, Any]]:
 		"""Parse a single X12 segment"""
 		try:
-			# Split by element separator (*)
-			elements = segment.split('*')
-
-			if not elements:
-				return None
-
+			elements = segment.split(self.element_separator)
 			segment_id = elements[0]
 
-			# Parse elements (skip segment ID)
-			parsed_elements = []
-			for i, element in enumerate(elements[1:], 1):
-				# Handle composite elements (sub-elements separated by :)
-				if ':' in element:
-					sub_elements = element.split(':')
-					parsed_elements.append(sub_elements)
-				else:
-					parsed_elements.append(element)
+			# Parse elements (skip segment ID); ISA16 is the component separator itself, not a composite
+			component = self.component_separator
+			if segment_id == 'ISA':
+				parsed_elements = elements[1:]
+			else:
+				parsed_elements = [
+					element.split(component) if component in element else element
+					for element in elements[1:]
+				]
 
 			return {
 				'segment_id': segment_id,
@@ -84,122 +179,25 @@ class X12Parser:
 			self.errors.append(f"Error parsing segment '{segment}': {str(e)}")
 			return None
 
-	def _build_hierarchy(self) -> Dict[str, Any]:
-		"""Build hierarchical structure from parsed segments"""
-		hierarchy = {
-			'interchange': {},
-			'functional_groups': [],
-			'transactions': []
-		}
-
-		current_group = None
-		current_transaction = None
 
-		for segment in self.segments:
-			segment_id = segment['segment_id']
+def envelope_summary(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+	"""
+	The parsed envelope without the transaction data segments, which are replaced by their count.
+	The full structure can always be rebuilt from the stored x12_content with X12Parser.
+	"""
+	def _transaction(transaction):
+		summary = {key: value for key, value in transaction.items() if key != 'segments'}
+		summary['segment_count'] = len(transaction.get('segments', ()))
+		return summary
 
-			if segment_id == 'ISA':
-				# Interchange Control Header
-				hierarchy['interchange'] = self._parse_isa_segment(segment)
-			elif segment_id == 'GS':
-				# Functional Group Header
-				current_group = self._parse_gs_segment(segment)
-				hierarchy['functional_groups'].append(current_group)
-			elif segment_id == 'ST':
-				# Transaction Set Header
-				current_transaction = self._parse_st_segment(segment)
-				if current_group:
-					current_group['transactions'].append(current_transaction)
-				else:
-					hierarchy['transactions'].append(current_transaction)
-			elif segment_id == 'SE':
-				# Transaction Set Trailer
-				if current_transaction:
-					current_transaction['trailer'] = self._parse_se_segment(segment)
-			elif segment_id == 'GE':
-				# Functional Group Trailer
-				if current_group:
-					current_group['trailer'] = self._parse_ge_segment(segment)
-			elif segment_id == 'IEA':
-				# Interchange Control Trailer
-				hierarchy['interchange']['trailer'] = self._parse_iea_segment(segment)
-			else:
-				# Transaction data segments
-				if current_transaction:
-					if 'segments' not in current_transaction:
-						current_transaction['segments'] = []
-					current_transaction['segments'].append(segment)
-
-		return hierarchy
-
-	def _parse_isa_segment(self, segment) -> Dict[str, Any]:
-		"""Parse ISA (Interchange Control Header) segment"""
-		elements = segment['elements']
-		return {
-			'authorization_qualifier': elements[0] if len(elements) > 0 else '',
-			'authorization_info': elements[1] if len(elements) > 1 else '',
-			'security_qualifier': elements[2] if len(elements) > 2 else '',
-			'security_info': elements[3] if len(elements) > 3 else '',
-			'sender_qualifier': elements[4] if len(elements) > 4 else '',
-			'sender_id': elements[5] if len(elements) > 5 else '',
-			'receiver_qualifier': elements[6] if len(elements) > 6 else '',
-			'receiver_id': elements[7] if len(elements) > 7 else '',
-			'date': elements[8] if len(elements) > 8 else '',
-			'time': elements[9] if len(elements) > 9 else '',
-			'control_standards_id': elements[10] if len(elements) > 10 else '',
-			'control_version': elements[11] if len(elements) > 11 else '',
-			'control_number': elements[12] if len(elements) > 12 else '',
-			'acknowledgment_requested': elements[13] if len(elements) > 13 else '',
-			'usage_indicator': elements[14] if len(elements) > 14 else '',
-		}
-
-	def _parse_gs_segment(self, segment) -> Dict[str, Any]:
-		"""Parse GS (Functional Group Header) segment"""
-		elements = segment['elements']
-		return {
-			'functional_id': elements[0] if len(elements) > 0 else '',
-			'application_sender': elements[1] if len(elements) > 1 else '',
-			'application_receiver': elements[2] if len(elements) > 2 else '',
-			'date': elements[3] if len(elements) > 3 else '',
-			'time': elements[4] if len(elements) > 4 else '',
-			'control_number': elements[5] if len(elements) > 5 else '',
-			'responsible_agency': elements[6] if len(elements) > 6 else '',
-			'version': elements[7] if len(elements) > 7 else '',
-			'transactions': []
-		}
-
-	def _parse_st_segment(self, segment) -> Dict[str, Any]:
-		"""Parse ST (Transaction Set Header) segment"""
-		elements = segment['elements']
-		return {
-			'transaction_set_id': elements[0] if len(elements) > 0 else '',
-			'transaction_set_control_number': elements[1] if len(elements) > 1 else '',
-			'segments': []
-		}
-
-	def _parse_se_segment(self, segment) -> Dict[str, Any]:
-		"""Parse SE (Transaction Set Trailer) segment"""
-		elements = segment['elements']
-		return {
-			'segment_count': elements[0] if len(elements) > 0 else '',
-			'transaction_set_control_number': elements[1] if len(elements) > 1 else '',
-		}
-
-	def _parse_ge_segment(self, segment) -> Dict[str, Any]:
-		"""Parse GE (Functional Group Trailer) segment"""
-		elements = segment['elements']
-		return {
-			'transaction_count': elements[0] if len(elements) > 0 else '',
-			'control_number': elements[1] if len(elements) > 1 else '',
-		}
-
-	def _parse_iea_segment(self, segment) -> Dict[str, Any]:
-		"""Parse IEA (Interchange Control Trailer) segment"""
-		elements = segment['elements']
-		return {
-			'functional_group_count': elements[0] if len(elements) > 0 else '',
-			'control_number': elements[1] if len(elements) > 1 else '',
-		}
+	return {
+		'interchange': parsed_data.get('interchange', {}),
+		'functional_groups': [
+			{**group, 'transactions': [_transaction(t) for t in group.get('transactions', [])]}
+			for group in parsed_data.get('functional_groups', [])
+		],
+		'transactions': [_transaction(t) for t in parsed_data.get('transactions', [])],
+	}
 
 
 class EDIValidator:
@@ -212,8 +210,16 @@ class EDIValidator:
 		"""Validate parsed EDI transaction data"""
 		self.validation_errors = []
 
-		# Get active validation rules
-		rules = EDIValidationRule.objects.filter(is_active=True)
+		# Active validation rules, grouped by the segment they apply to; core.cache drops the
+		# cached list whenever a rule is saved or deleted
+		rules = defaultdict(list)
+		active_rules = CacheManager.get_or_set(
+			EDI_VALIDATION_RULES_KEY,
+			lambda: list(EDIValidationRule.objects.filter(is_active=True)),
+			timeout=3600,
+		)
+		for rule in active_rules:
+			rules[rule.segment_id].append(rule)
 
 		# Validate interchange level
 		if 'interchange' in parsed_data:
@@ -234,8 +240,7 @@ class EDIValidator:
 	def _validate_interchange(self, interchange: Dict[str, Any], rules):
 		"""Validate interchange control segments"""
 		# Validate ISA segment
-		isa_rules = rules.filter(segment_id='ISA')
-		for rule in isa_rules:
+		for rule in rules.get('ISA', ()):
 			if rule.element_position and rule.element_position <= len(interchange):
 				value = interchange.get(f'element_{rule.element_position}')
 				errors = rule.validate_element(value)
@@ -244,8 +249,7 @@ class EDIValidator:
 	def _validate_functional_group(self, group: Dict[str, Any], rules):
 		"""Validate functional group segments"""
 		# Validate GS segment
-		gs_rules = rules.filter(segment_id='GS')
-		for rule in gs_rules:
+		for rule in rules.get('GS', ()):
 			if rule.element_position and rule.element_position <= len(group):
 				value = group.get(f'element_{rule.element_position}')
 				errors = rule.validate_element(value)
@@ -258,9 +262,7 @@ class EDIValidator:
 
 		for segment in transaction['segments']:
 			segment_id = segment.get('segment_id')
-			segment_rules = rules.filter(segment_id=segment_id)
-
-			for rule in segment_rules:
+			for rule in rules.get(segment_id, ()):
 				if rule.element_position and rule.element_position <= len(segment.get('elements', [])):
 					value = segment['elements'][rule.element_position - 1]
 					errors = rule.validate_element(value)
@@ -271,6 +273,18 @@ class EDIValidator:
 					self.validation_errors.extend(errors)
 
 
+def _check_row(transaction: EDITransaction) -> None:
+	"""
+	Run the model's field validation on an unsaved transaction, raising ValidationError.
+	Empty values and relations are skipped: the single-submission path stores those as-is.
+	"""
+	exclude = [
+		field.name for field in transaction._meta.concrete_fields
+		if field.is_relation or getattr(transaction, field.attname) in field.empty_values
+	]
+	transaction.clean_fields(exclude=exclude)
+
+
 class EDIProcessor:
 	"""Main processor for EDI transactions"""
 
@@ -285,60 +299,104 @@ class EDIProcessor:
 		Returns: (success, message, response_data)
 		"""
 		try:
-			# Parse the X12 content
-			self.parser = X12Parser(x12_content)
-			parsed_data = self.parser.parse()
-
-			if self.parser.errors:
-				return False, f"Parse errors: {', '.join(self.parser.errors)}", {}
-
-			# Validate the parsed data
-			validation_errors = self.validator.validate_transaction(parsed_data)
-
-			# Create EDI transaction record
-			transaction_id = f"EDI-{uuid.uuid4().hex[:12].upper()}"
-
-			transaction = EDITransaction.objects.create(
-				transaction_id=transaction_id,
-				transaction_type=transaction_type,
-				status=EDITransaction.Status.PENDING,
-				sender_id=parsed_data.get('interchange', {}).get('sender_id', ''),
-				receiver_id=parsed_data.get('interchange', {}).get('receiver_id', ''),
-				provider=provider,
-				x12_content=x12_content,
-				parsed_data=parsed_data,
-				segment_count=len(self.parser.segments),
-				control_number=parsed_data.get('interchange', {}).get('control_number', ''),
-				claim=claim,
-				patient=patient
+			success, message, transaction, response_data = self._prepare_submission(
+				x12_content, transaction_type, provider=provider, claim=claim, patient=patient
 			)
+			if success:
+				transaction.save()
+			return success, message, response_data
+
+		except Exception as e:
+			return False, f"Processing error: {str(e)}", {}
 
-			# Determine status based on validation
-			if validation_errors:
-				transaction.mark_error(
-					error_message="Validation errors found",
-					validation_errors=validation_errors
+	def process_edi_batch(self, x12_contents: List[str], transaction_type: str,
+						  provider=None) -> List[Tuple[bool, str, Dict[str, Any]]]:
+		"""
+		Process many EDI submissions (e.g. a nightly 837 dump) and store the accepted ones
+		with one bulk insert. Returns one (success, message, response_data) per input, in order.
+		"""
+		results = []
+		pending = []
+		for x12_content in x12_contents:
+			try:
+				success, message, transaction, response_data = self._prepare_submission(
+					x12_content, transaction_type, provider=provider
 				)
-				status = "ACCEPTED_WITH_ERRORS"
-				message = f"EDI accepted with {len(validation_errors)} validation errors"
-			else:
-				transaction.mark_sent()
-				status = "ACCEPTED"
-				message = "EDI accepted and queued for processing"
-
-			response_data = {
-				'status': status,
-				'transaction_id': transaction_id,
-				'message': message,
-				'segment_count': len(self.parser.segments),
-				'validation_errors': validation_errors,
-				'parsed_data': parsed_data
-			}
+				if success:
+					# Catch rows the insert would reject (e.g. an over-long sender ID) before they sink the batch
+					_check_row(transaction)
+			except Exception as e:
+				success, message, transaction, response_data = False, f"Processing error: {str(e)}", None, {}
+			if success:
+				pending.append((len(results), transaction))
+			results.append((success, message, response_data))
 
-			return True, message, response_data
+		try:
+			with db_transaction.atomic():
+				EDITransaction.objects.bulk_create([transaction for _, transaction in pending], batch_size=500)
+		except DatabaseError as e:
+			# Nothing was stored, so none of the accepted rows may report success
+			for index, _ in pending:
+				results[index] = (False, f"Processing error: {str(e)}", {})
+		return results
+
+	def _prepare_submission(self, x12_content: str, transaction_type: str,
+							provider=None, claim=None, patient=None):
+		"""
+		Parse and validate one submission and build its unsaved EDITransaction, with the final
+		status already set so storing it is a single INSERT.
+		Returns: (success, message, transaction, response_data)
+		"""
+		# Parse the X12 content
+		self.parser = X12Parser(x12_content)
+		parsed_data = self.parser.parse()
+
+		if self.parser.errors:
+			return False, f"Parse errors: {', '.join(self.parser.errors)}", None, {}
+
+		# Validate the parsed data
+		validation_errors = self.validator.validate_transaction(parsed_data)
+
+		# Create EDI transaction record
+		transaction_id = f"EDI-{uuid.uuid4().hex[:12].upper()}"
+
+		transaction = EDITransaction(
+			transaction_id=transaction_id,
+			transaction_type=transaction_type,
+			sender_id=parsed_data.get('interchange', {}).get('sender_id', ''),
+			receiver_id=parsed_data.get('interchange', {}).get('receiver_id', ''),
+			provider=provider,
+			x12_content=x12_content,
+			parsed_data=envelope_summary(parsed_data),
+			segment_count=len(self.parser.segments),
+			control_number=parsed_data.get('interchange', {}).get('control_number', ''),
+			claim=claim,
+			patient=patient
+		)
+
+		# Determine status based on validation (same fields mark_error/mark_sent would set)
+		if validation_errors:
+			transaction.status = EDITransaction.Status.ERROR
+			transaction.error_message = "Validation errors found"
+			transaction.validation_errors = validation_errors
+			status = "ACCEPTED_WITH_ERRORS"
+			message = f"EDI accepted with {len(validation_errors)} validation errors"
+		else:
+			transaction.status = EDITransaction.Status.SENT
+			transaction.processed_at = timezone.now()
+			status = "ACCEPTED"
+			message = "EDI accepted and queued for processing"
+
+		response_data = {
+			'status': status,
+			'transaction_id': transaction_id,
+			'message': message,
+			'segment_count': len(self.parser.segments),
+			'validation_errors': validation_errors,
+			'parsed_data': parsed_data
+		}
 
-		except Exception as e:
-			return False, f"Processing error: {str(e)}", {}
+		return True, message, transaction, response_data
 
 	def get_transaction_status(self, transaction_id: str) -> Optional[EDITransaction]:
 		"""Get EDI transaction by ID"""
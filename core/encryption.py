@@ -5,6 +5,10 @@ Provides encrypted field types and key management for HIPAA/GDPR compliance.
 
 import os
 import base64
+import logging
+from datetime import date
+import threading
+from functools import cached_property, lru_cache
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -12,27 +16,66 @@ from django.conf import settings
 from django.db import models
 from django.core.exceptions import ImproperlyConfigured
 
+try:
+    # Optional Rust implementation of the same Fernet token format; much faster on the
+    # small PHI values these fields hold
+    from rfernet import Fernet as RustFernet
+except ImportError:
+    RustFernet = None
+
+logger = logging.getLogger(__name__)
+
+
+class _RustFernetCipher:
+    """Adapts rfernet (str keys and tokens) to the bytes API of cryptography's Fernet."""
+
+    def __init__(self, key):
+        self._fernet = RustFernet(key.decode('ascii'))
+
+    def encrypt(self, data):
+        token = self._fernet.encrypt(data)
+        return token.encode('ascii') if isinstance(token, str) else token
+
+    def decrypt(self, token):
+        return bytes(self._fernet.decrypt(token.decode('ascii')))
+
+
+# Returned in place of values that can't be decrypted with the current key
+DECRYPTION_FAILED = "[ENCRYPTED DATA]"
+
+# Shortest possible Fernet token: base64 of version, timestamp, IV, one AES block and HMAC
+MIN_TOKEN_LENGTH = 100
+
+# Decrypted values kept per process; a few full list pages' worth of encrypted columns
+DECRYPT_CACHE_SIZE = 4096
+
 
 class EncryptionManager:
     """Manages encryption keys and provides encryption/decryption services."""
 
     def __init__(self):
-        self._key = None
-        self._fernet = None
+        self._init_lock = threading.Lock()
+        # Tokens are bound to the current key, so a token always decrypts to the same value
+        self._decrypt_cached = lru_cache(maxsize=DECRYPT_CACHE_SIZE)(self._decrypt_token)
 
-    @property
+    # Both are built once under a lock and stored in the instance dict before it is released,
+    # so a thread that waited on the lock finds the value instead of building another
+    @cached_property
     def key(self):
         """Get or generate the encryption key."""
-        if self._key is None:
-            self._key = self._get_or_create_key()
-        return self._key
+        with self._init_lock:
+            if 'key' not in self.__dict__:
+                self.__dict__['key'] = self._get_or_create_key()
+            return self.__dict__['key']
 
-    @property
+    @cached_property
     def fernet(self):
         """Get the Fernet cipher instance."""
-        if self._fernet is None:
-            self._fernet = Fernet(self.key)
-        return self._fernet
+        key = self.key
+        with self._init_lock:
+            if 'fernet' not in self.__dict__:
+                self.__dict__['fernet'] = _RustFernetCipher(key) if RustFernet is not None else Fernet(key)
+            return self.__dict__['fernet']
 
     def _get_or_create_key(self):
         """Get existing key or create a new one."""
@@ -72,16 +115,38 @@ class EncryptionManager:
         if ciphertext is None or ciphertext == '':
             return ciphertext
 
-        if isinstance(ciphertext, str):
-            ciphertext = ciphertext.encode('utf-8')
+        if isinstance(ciphertext, bytes):
+            ciphertext = ciphertext.decode('utf-8')
 
+        return self._decrypt_cached(ciphertext)
+
+    def _decrypt_token(self, ciphertext):
         try:
-            decrypted = self.fernet.decrypt(ciphertext)
+            decrypted = self.fernet.decrypt(ciphertext.encode('utf-8'))
             return decrypted.decode('utf-8')
         except Exception as e:
             # Log the error but don't expose sensitive information
-            print(f"Decryption failed: {type(e).__name__}")
-            return "[ENCRYPTED DATA]"
+            logger.warning("Decryption failed: %s", type(e).__name__)
+            return DECRYPTION_FAILED
+
+    def clear_decrypt_cache(self):
+        """Drop cached plaintext, e.g. after the key changes."""
+        self._decrypt_cached.cache_clear()
+
+    def decrypt_many(self, ciphertexts):
+        """Decrypt a sequence of values in one loop, resolving the cipher once."""
+        decrypt = self.fernet.decrypt
+        results = []
+        for ciphertext in ciphertexts:
+            if ciphertext is None or ciphertext == '':
+                results.append(ciphertext)
+                continue
+            try:
+                results.append(decrypt(ciphertext.encode('utf-8')).decode('utf-8'))
+            except Exception as e:
+                logger.warning("Decryption failed: %s", type(e).__name__)
+                results.append(DECRYPTION_FAILED)
+        return results
 
 
 # Global encryption manager instance
@@ -104,6 +169,9 @@ class EncryptedCharField(models.CharField):
         """Decrypt data when converting to Python."""
         if value is None:
             return value
+        if isinstance(value, str) and len(value) < MIN_TOKEN_LENGTH:
+            # Too short to be a token, so it's already plaintext (form input, full_clean)
+            return value
         return encryption_manager.decrypt(value)
 
     def get_prep_value(self, value):
@@ -135,6 +203,9 @@ class EncryptedTextField(models.TextField):
         """Decrypt data when converting to Python."""
         if value is None:
             return value
+        if isinstance(value, str) and len(value) < MIN_TOKEN_LENGTH:
+            # Too short to be a token, so it's already plaintext (form input, full_clean)
+            return value
         return encryption_manager.decrypt(value)
 
     def get_prep_value(self, value):
@@ -163,10 +234,9 @@ class EncryptedDateField(models.CharField):
         if value is None:
             return value
         decrypted = encryption_manager.decrypt(value)
-        if decrypted and decrypted != "[ENCRYPTED DATA]":
-            from datetime import datetime
+        if decrypted and decrypted != DECRYPTION_FAILED:
             try:
-                return datetime.fromisoformat(decrypted).date()
+                return date.fromisoformat(decrypted[:10])
             except ValueError:
                 return None
         return None
@@ -176,11 +246,16 @@ class EncryptedDateField(models.CharField):
         if value is None:
             return value
         if isinstance(value, str):
+            if len(value) == 10 and value[4] == '-' and value[7] == '-':
+                # Already a plain ISO date, e.g. from a form or full_clean
+                try:
+                    return date.fromisoformat(value)
+                except ValueError:
+                    pass
             decrypted = encryption_manager.decrypt(value)
-            if decrypted and decrypted != "[ENCRYPTED DATA]":
-                from datetime import datetime
+            if decrypted and decrypted != DECRYPTION_FAILED:
                 try:
-                    return datetime.fromisoformat(decrypted).date()
+                    return date.fromisoformat(decrypted[:10])
                 except ValueError:
                     return None
         return value
@@ -202,6 +277,19 @@ class EncryptedDateField(models.CharField):
         return super().get_col(alias, output_field)
 
 
+def decrypted_column(queryset, field_name):
+    """
+    Decrypted values of one encrypted text/char column for every row of a queryset.
+
+    The column is read as plain text (skipping the field's per-row from_db_value) and
+    decrypted in a single decrypt_many pass. Encrypted date fields come back as ISO strings.
+    """
+    from django.db.models.functions import Cast
+
+    raw = queryset.annotate(_ciphertext=Cast(field_name, models.TextField())).values_list('_ciphertext', flat=True)
+    return encryption_manager.decrypt_many(raw)
+
+
 def get_encryption_key():
     """Get the current encryption key (for backup/admin purposes)."""
     return encryption_manager.key.decode('utf-8')
@@ -214,4 +302,6 @@ def rotate_encryption_key():
     # 2. Generating new key
     # 3. Re-encrypting all data with new key
     # 4. Updating the key in settings
+    # 5. Clearing decrypted values cached under the old key
+    encryption_manager.clear_decrypt_cache()
     raise NotImplementedError("Key rotation requires careful planning and data migration")
\ No newline at end of file
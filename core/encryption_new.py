@@ -5,6 +5,7 @@ Provides encrypted field types and key management for HIPAA/GDPR compliance.
 
 import os
 import base64
+from datetime import date
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -13,6 +14,10 @@ from django.db import models
 from django.core.exceptions import ImproperlyConfigured
 
 
+# Returned in place of values that can't be decrypted with the current key
+DECRYPTION_FAILED = "[ENCRYPTED DATA]"
+
+
 class EncryptionManager:
     """Manages encryption keys and provides encryption/decryption services."""
 
@@ -81,7 +86,7 @@ class EncryptionManager:
         except Exception as e:
             # Log the error but don't expose sensitive information
             print(f"Decryption failed: {type(e).__name__}")
-            return "[ENCRYPTED DATA]"
+            return DECRYPTION_FAILED
 
 
 # Global encryption manager instance
@@ -161,10 +166,9 @@ class EncryptedDateField(models.DateField):
         if value is None:
             return value
         decrypted = encryption_manager.decrypt(value)
-        if decrypted and decrypted != "[ENCRYPTED DATA]":
-            from datetime import datetime
+        if decrypted and decrypted != DECRYPTION_FAILED:
             try:
-                return datetime.fromisoformat(decrypted).date()
+                return date.fromisoformat(decrypted[:10])
             except ValueError:
                 return None
         return None
@@ -175,10 +179,9 @@ class EncryptedDateField(models.DateField):
             return value
         if isinstance(value, str):
             decrypted = encryption_manager.decrypt(value)
-            if decrypted and decrypted != "[ENCRYPTED DATA]":
-                from datetime import datetime
+            if decrypted and decrypted != DECRYPTION_FAILED:
                 try:
-                    return datetime.fromisoformat(decrypted).date()
+                    return date.fromisoformat(decrypted[:10])
                 except ValueError:
                     return None
         return value
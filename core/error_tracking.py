@@ -4,15 +4,22 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.utils import timezone
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+# SMTP sends run here so a slow mail server doesn't hold up the failing request's 500 response
+_EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='err-mail')
+
 
 class ErrorTracker:
     """Custom error tracking and alerting system"""
 
+    ALERT_TIMES_MAX = 1024
+
     def __init__(self):
         self.logger = logging.getLogger('medical_aid.errors')
         self.alert_cooldown = timedelta(minutes=5)  # Don't send alerts too frequently
+        # error type -> last alert time, kept in insertion order and pruned past ALERT_TIMES_MAX
         self.last_alert_time = {}
 
     def track_error(self, error, request=None, user=None, context=None):
@@ -23,20 +30,24 @@ class ErrorTracker:
             'timestamp': timezone.now().isoformat(),
             'error_type': type(error).__name__,
             'error_message': str(error),
-            'traceback': traceback.format_exc(),
+            # Formatted only if an alert email actually goes out
+            'traceback': None,
             'request': self._extract_request_info(request) if request else None,
             'user': self._extract_user_info(user) if user else None,
             'context': context or {},
         }
 
+        # Serialized once for both the log record and the alert email
+        serialized = json.dumps(error_data, default=str, indent=2)
+
         # Log the error
         self.logger.error(
             f"Error tracked: {error_data['error_type']}: {error_data['error_message']}",
-            extra={'error_data': json.dumps(error_data, default=str)}
+            extra={'error_data': serialized}
         )
 
         # Check if we should send an alert
-        self._check_and_send_alert(error_data)
+        self._check_and_send_alert(error_data, error, serialized)
 
         return error_data
 
@@ -71,12 +82,12 @@ class ErrorTracker:
         """Get the client's IP address"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
+            ip = x_forwarded_for.partition(',')[0].strip()
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
 
-    def _check_and_send_alert(self, error_data):
+    def _check_and_send_alert(self, error_data, error=None, serialized=None):
         """Check if we should send an alert for this error"""
         error_type = error_data['error_type']
         now = timezone.now()
@@ -87,16 +98,40 @@ class ErrorTracker:
             if time_since_last_alert < self.alert_cooldown:
                 return  # Too soon to send another alert
 
-        # Update last alert time
+        # Update last alert time; re-inserting keeps the dict ordered oldest first
+        self.last_alert_time.pop(error_type, None)
         self.last_alert_time[error_type] = now
+        if len(self.last_alert_time) > self.ALERT_TIMES_MAX:
+            self._prune_alert_times(now)
 
         # Send alert
-        self._send_alert_email(error_data)
-
-    def _send_alert_email(self, error_data):
+        future = _EMAIL_EXECUTOR.submit(self._send_alert_email, error_data, error, serialized)
+        future.add_done_callback(self._log_alert_failure)
+
+    def _log_alert_failure(self, future):
+        """Log anything the background alert send raised"""
+        exc = future.exception()
+        if exc is not None:
+            self.logger.error(f"Error alert email task failed: {str(exc)}")
+
+    def _prune_alert_times(self, now):
+        """Drop cooldowns that have expired, then the oldest entries if still over the cap"""
+        cutoff = now - self.alert_cooldown
+        for error_type, alerted_at in list(self.last_alert_time.items()):
+            if alerted_at >= cutoff and len(self.last_alert_time) <= self.ALERT_TIMES_MAX:
+                break
+            del self.last_alert_time[error_type]
+
+    def _send_alert_email(self, error_data, error=None, serialized=None):
         """Send an alert email for the error"""
         if not settings.DEBUG:  # Only send emails in production
             try:
+                if error is not None and error_data['traceback'] is None:
+                    error_data['traceback'] = ''.join(
+                        traceback.format_exception(type(error), error, error.__traceback__)
+                    )
+                if serialized is None:
+                    serialized = json.dumps(error_data, default=str, indent=2)
                 subject = f"Medical Aid Error Alert: {error_data['error_type']}"
 
                 message = f"""
@@ -106,14 +141,8 @@ Error Type: {error_data['error_type']}
 Message: {error_data['error_message']}
 Timestamp: {error_data['timestamp']}
 
-Request Info:
-{json.dumps(error_data['request'], indent=2) if error_data['request'] else 'No request info'}
-
-User Info:
-{json.dumps(error_data['user'], indent=2) if error_data['user'] else 'No user info'}
-
-Context:
-{json.dumps(error_data['context'], indent=2) if error_data['context'] else 'No context'}
+Details (request, user and context):
+{serialized}
 
 Traceback:
 {error_data['traceback']}
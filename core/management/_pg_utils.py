@@ -0,0 +1,12 @@
+"""Catalog helpers shared by the database reset commands."""
+
+
+def list_public_tables(cursor):
+    """Names of the user tables in the public schema, skipping pg_/sql_ system tables."""
+    cursor.execute("""
+        SELECT tablename
+        FROM pg_tables
+        WHERE schemaname = 'public'
+        AND tablename !~ '^(pg_|sql_)'
+    """)
+    return tuple(row[0] for row in cursor.fetchall())
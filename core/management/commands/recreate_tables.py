@@ -2,6 +2,8 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 from django.core.management import call_command
 
+from core.management._pg_utils import list_public_tables
+
 
 class Command(BaseCommand):
     help = 'Drop and recreate all tables (alternative to flush for managed databases)'
@@ -33,26 +35,27 @@ class Command(BaseCommand):
 
         with connection.cursor() as cursor:
             # Get all table names
-            cursor.execute("""
-                SELECT tablename
-                FROM pg_tables
-                WHERE schemaname = 'public'
-                AND tablename NOT LIKE 'pg_%'
-                AND tablename NOT LIKE 'sql_%'
-            """)
-
-            tables = [row[0] for row in cursor.fetchall()]
+            tables = list_public_tables(cursor)
 
             if tables:
-                # Drop all tables
-                for table in tables:
-                    try:
-                        cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE')
-                        self.stdout.write(f'  - Dropped {table}')
-                    except Exception as e:
-                        self.stdout.write(
-                            self.style.WARNING(f'  - Failed to drop {table}: {e}')
-                        )
+                # Drop all tables in one statement; fall back to one at a time if that fails
+                try:
+                    cursor.execute(
+                        'DROP TABLE IF EXISTS ' + ', '.join(f'"{table}"' for table in tables) + ' CASCADE'
+                    )
+                    self.stdout.write(f'  - Dropped {len(tables)} tables')
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.WARNING(f'  - Bulk drop failed ({e}), dropping tables individually')
+                    )
+                    for table in tables:
+                        try:
+                            cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE')
+                            self.stdout.write(f'  - Dropped {table}')
+                        except Exception as e:
+                            self.stdout.write(
+                                self.style.WARNING(f'  - Failed to drop {table}: {e}')
+                            )
 
         # Run migrations to recreate tables
         if not options['no_migrations']:
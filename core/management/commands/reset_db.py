@@ -3,6 +3,8 @@ from django.db import connection
 from django.contrib.auth import get_user_model
 from django.apps import apps
 
+from core.management._pg_utils import list_public_tables
+
 
 class Command(BaseCommand):
     help = 'Reset database by truncating all tables (safe for production)'
@@ -28,15 +30,7 @@ class Command(BaseCommand):
 
         with connection.cursor() as cursor:
             # Get all table names
-            cursor.execute("""
-                SELECT tablename
-                FROM pg_tables
-                WHERE schemaname = 'public'
-                AND tablename NOT LIKE 'pg_%'
-                AND tablename NOT LIKE 'sql_%'
-            """)
-
-            tables = [row[0] for row in cursor.fetchall()]
+            tables = list_public_tables(cursor)
 
             if not tables:
                 self.stdout.write(self.style.SUCCESS('✅ Database is already empty'))
@@ -45,15 +39,24 @@ class Command(BaseCommand):
             # Disable foreign key checks
             cursor.execute("SET session_replication_role = 'replica'")
 
-            # Truncate all tables
-            for table in tables:
-                try:
-                    cursor.execute(f'TRUNCATE TABLE "{table}" CASCADE')
-                    self.stdout.write(f'  - Cleared {table}')
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.WARNING(f'  - Failed to clear {table}: {e}')
-                    )
+            # Truncate all tables in one statement; fall back to one at a time if that fails
+            try:
+                cursor.execute(
+                    'TRUNCATE TABLE ' + ', '.join(f'"{table}"' for table in tables) + ' CASCADE'
+                )
+                self.stdout.write(f'  - Cleared {len(tables)} tables')
+            except Exception as e:
+                self.stdout.write(
+                    self.style.WARNING(f'  - Bulk truncate failed ({e}), clearing tables individually')
+                )
+                for table in tables:
+                    try:
+                        cursor.execute(f'TRUNCATE TABLE "{table}" CASCADE')
+                        self.stdout.write(f'  - Cleared {table}')
+                    except Exception as e:
+                        self.stdout.write(
+                            self.style.WARNING(f'  - Failed to clear {table}: {e}')
+                        )
 
             # Re-enable foreign key checks
             cursor.execute("SET session_replication_role = 'origin'")
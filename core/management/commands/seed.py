@@ -1,7 +1,13 @@
+import os
+
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, Q
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.utils import timezone
+from collections import Counter
 from datetime import timedelta, date
 from decimal import Decimal
 
@@ -9,6 +15,7 @@ from schemes.models import SchemeCategory, SchemeBenefit, BenefitType
 from claims.models import Patient, Claim, Invoice
 from accounts.models import ProviderProfile
 from core.models import SystemSettings
+from core.cache import SCHEME_BENEFIT_KEY, delete_on_commit
 
 
 class Command(BaseCommand):
@@ -35,12 +42,34 @@ class Command(BaseCommand):
             action='store_true',
             help='Only seed basic data (users, schemes, patients, claims)'
         )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-run the basic data seeding even if the database is already seeded'
+        )
+        parser.add_argument(
+            '--skip-claims',
+            action='store_true',
+            help='Skip the sample claims and invoices'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=int(os.getenv('SEED_BATCH_SIZE', '500')),
+            help='Rows per INSERT/UPDATE for bulk writes (default: SEED_BATCH_SIZE or 500)'
+        )
 
     def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.skip_claims = options['skip_claims']
         self.stdout.write(self.style.SUCCESS('🚀 Starting comprehensive database seeding...'))
 
-        # Run basic data seeding
-        self.seed_basic_data()
+        # Run basic data seeding; one commit for the whole batch instead of one per row
+        if self.is_seeded() and not options['force']:
+            self.stdout.write('Basic data already seeded, skipping (use --force to re-run)')
+        else:
+            with transaction.atomic():
+                self.seed_basic_data()
 
         # Run additional seed commands if not skipped
         if not options['basic_only']:
@@ -68,6 +97,50 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('\n✅ Database seeding completed successfully!'))
         self.display_summary()
 
+    def is_seeded(self):
+        """Cheap EXISTS probes for the admin user, a scheme benefit and a claim"""
+        return (
+            get_user_model().objects.filter(username='admin').exists()
+            and SchemeBenefit.objects.exists()
+            and Claim.objects.exists()
+        )
+
+    def seed_password_hash(self):
+        """Hash the shared fixture password once per run instead of once per user"""
+        if getattr(self, '_seed_password_hash', None) is None:
+            self._seed_password_hash = make_password('Password123!')
+        return self._seed_password_hash
+
+    def ensure_users(self, User, rows, role, email_domain):
+        """Create any missing fixture users in one INSERT and return them keyed by username"""
+        usernames = [row['username'] for row in rows]
+        # ON CONFLICT DO NOTHING leaves existing users untouched
+        User.objects.bulk_create(
+            [
+                User(
+                    username=row['username'],
+                    role=role,
+                    email=f"{row['username']}@{email_domain}",
+                    first_name=row['first_name'],
+                    last_name=row['last_name'],
+                    password=self.seed_password_hash(),
+                )
+                for row in rows
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+        # Re-read so rows inserted above carry their PKs (ignore_conflicts doesn't return them)
+        users = User.objects.in_bulk(usernames, field_name='username')
+
+        # Existing fixture users left without a password get the seed one
+        passwordless = [user for user in users.values() if not user.password]
+        for user in passwordless:
+            user.password = self.seed_password_hash()
+        User.objects.bulk_update(passwordless, ['password'], batch_size=self.batch_size)
+        return users
+
     def seed_basic_data(self):
         """Seed the core medical aid data"""
         self.stdout.write('🏥 Seeding core medical aid data...')
@@ -85,7 +158,7 @@ class Command(BaseCommand):
             }
         )
         if created or not admin.password:
-            admin.set_password('Password123!')
+            admin.password = self.seed_password_hash()
         admin.is_staff = True
         admin.is_superuser = True
         admin.save()
@@ -114,33 +187,21 @@ class Command(BaseCommand):
             }
         ]
 
-        providers = []
-        for provider_data in providers_data:
-            provider, created = User.objects.get_or_create(
-                username=provider_data['username'],
-                defaults={
-                    'role': 'PROVIDER',
-                    'email': f"{provider_data['username']}@medicalaid.com",
-                    'first_name': provider_data['first_name'],
-                    'last_name': provider_data['last_name']
-                }
-            )
-            if created or not provider.password:
-                provider.set_password('Password123!')
-                provider.save()
+        provider_users = self.ensure_users(User, providers_data, 'PROVIDER', 'medicalaid.com')
+        providers = [provider_users[provider_data['username']] for provider_data in providers_data]
 
-            # Create provider profile
-            profile, _ = ProviderProfile.objects.get_or_create(
+        # Create provider profiles; providers that already have one are skipped by ON CONFLICT
+        ProviderProfile.objects.bulk_create([
+            ProviderProfile(
                 user=provider,
-                defaults={
-                    'facility_name': provider_data['facility_name'],
-                    'facility_type': provider_data['facility_type'],
-                    'phone': provider_data['phone'],
-                    'address': provider_data['address'],
-                    'city': provider_data['city']
-                }
+                facility_name=provider_data['facility_name'],
+                facility_type=provider_data['facility_type'],
+                phone=provider_data['phone'],
+                address=provider_data['address'],
+                city=provider_data['city']
             )
-            providers.append(provider)
+            for provider, provider_data in zip(providers, providers_data)
+        ], batch_size=self.batch_size, ignore_conflicts=True)
 
         # Create comprehensive benefit types
         benefit_types_data = [
@@ -149,10 +210,14 @@ class Command(BaseCommand):
             'PHYSIOTHERAPY', 'DENTAL', 'OPTICAL', 'MATERNITY'
         ]
 
-        benefit_types = {}
-        for bt_name in benefit_types_data:
-            bt, _ = BenefitType.objects.get_or_create(name=bt_name)
-            benefit_types[bt_name] = bt
+        BenefitType.objects.bulk_create(
+            [BenefitType(name=bt_name) for bt_name in benefit_types_data],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        # bulk_create skips the post_save receiver that drops the cached list
+        delete_on_commit('benefit_types')
+        benefit_types = BenefitType.objects.in_bulk(benefit_types_data, field_name='name')
 
         # Create comprehensive scheme categories
         schemes_data = [
@@ -178,16 +243,20 @@ class Command(BaseCommand):
             }
         ]
 
-        schemes = {}
-        for scheme_data in schemes_data:
-            scheme, _ = SchemeCategory.objects.get_or_create(
-                name=scheme_data['name'],
-                defaults={
-                    'description': scheme_data['description'],
-                    'price': scheme_data['price']
-                }
-            )
-            schemes[scheme_data['name']] = scheme
+        scheme_names = [scheme_data['name'] for scheme_data in schemes_data]
+        SchemeCategory.objects.bulk_create(
+            [
+                SchemeCategory(
+                    name=scheme_data['name'],
+                    description=scheme_data['description'],
+                    price=scheme_data['price']
+                )
+                for scheme_data in schemes_data
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        schemes = SchemeCategory.objects.in_bulk(scheme_names, field_name='name')
 
         # Create comprehensive scheme benefits
         benefits_config = {
@@ -230,27 +299,37 @@ class Command(BaseCommand):
             ]
         }
 
+        # Existing (scheme, benefit_type) pairs keep their settings; ON CONFLICT skips them
+        preauth_types = {'SURGERY', 'SPECIALIST', 'IMAGING'}
+        preauth_limit_types = {'SURGERY', 'SPECIALIST'}
+        waiting_period_types = {'DENTAL', 'OPTICAL'}
+        preauth_threshold = Decimal('1000.00')
+        scheme_benefits = []
         for scheme_name, benefits in benefits_config.items():
             scheme = schemes[scheme_name]
-            for benefit_data in benefits:
-                bt_name, coverage_amount, coverage_limit_count, coverage_period, deductible, copay_percent, copay_fixed = benefit_data
+            for bt_name, coverage_amount, coverage_limit_count, coverage_period, deductible, copay_percent, copay_fixed in benefits:
 
-                SchemeBenefit.objects.get_or_create(
+                scheme_benefits.append(SchemeBenefit(
                     scheme=scheme,
                     benefit_type=benefit_types[bt_name],
-                    defaults={
-                        'coverage_amount': coverage_amount,
-                        'coverage_limit_count': coverage_limit_count,
-                        'coverage_period': coverage_period,
-                        'deductible_amount': deductible,
-                        'copayment_percentage': copay_percent,
-                        'copayment_fixed': copay_fixed,
-                        'requires_preauth': bt_name in ['SURGERY', 'SPECIALIST', 'IMAGING'] and coverage_amount > Decimal('1000.00'),
-                        'preauth_limit': Decimal('1000.00') if bt_name in ['SURGERY', 'SPECIALIST'] else None,
-                        'waiting_period_days': 30 if bt_name in ['DENTAL', 'OPTICAL'] else 0,
-                        'network_only': bt_name == 'EMERGENCY'
-                    }
-                )
+                    coverage_amount=coverage_amount,
+                    # Same default SchemeBenefit.save() applies, which bulk_create bypasses
+                    coverage_limit_count=coverage_limit_count if coverage_limit_count is not None else 1,
+                    coverage_period=coverage_period,
+                    deductible_amount=deductible,
+                    copayment_percentage=copay_percent,
+                    copayment_fixed=copay_fixed,
+                    requires_preauth=bt_name in preauth_types and coverage_amount > preauth_threshold,
+                    preauth_limit=preauth_threshold if bt_name in preauth_limit_types else None,
+                    waiting_period_days=30 if bt_name in waiting_period_types else 0,
+                    network_only=bt_name == 'EMERGENCY'
+                ))
+
+        SchemeBenefit.objects.bulk_create(scheme_benefits, batch_size=self.batch_size, ignore_conflicts=True)
+        delete_on_commit(*(
+            SCHEME_BENEFIT_KEY.format(scheme_id=benefit.scheme_id, benefit_type_id=benefit.benefit_type_id)
+            for benefit in scheme_benefits
+        ))
 
         # Create diverse patient users and profiles
         patients_data = [
@@ -292,56 +371,66 @@ class Command(BaseCommand):
             },
         ]
 
-        patients = []
-        principal_members = {}
+        patient_users = self.ensure_users(User, patients_data, 'PATIENT', 'email.com')
+        today = date.today()
+        enrollment_date = today - timedelta(days=365)  # Enrolled 1 year ago
+        benefit_year_start = date(today.year, 1, 1)  # Benefit year starts Jan 1
 
-        for patient_data in patients_data:
-            # Create user
-            patient_user, created = User.objects.get_or_create(
-                username=patient_data['username'],
-                defaults={
-                    'role': 'PATIENT',
-                    'email': f"{patient_data['username']}@email.com",
-                    'first_name': patient_data['first_name'],
-                    'last_name': patient_data['last_name']
-                }
-            )
-            if created or not patient_user.password:
-                patient_user.set_password('Password123!')
-                patient_user.save()
-
-            # Determine principal member
-            principal_member = None
-            if patient_data['relationship'] == 'SPOUSE':
-                # Find principal with same last name
-                principal_member = principal_members.get(patient_data['last_name'])
-
-            # Create patient profile
-            patient, created = Patient.objects.get_or_create(
-                user=patient_user,
-                defaults={
-                    'date_of_birth': patient_data['dob'],
-                    'gender': patient_data['gender'],
-                    'scheme': schemes[patient_data['scheme']],
-                    'status': patient_data['status'],
-                    'phone': patient_data['phone'],
-                    'relationship': patient_data['relationship'],
-                    'principal_member': principal_member,
-                    'emergency_contact': patient_data['emergency_contact'],
-                    'emergency_phone': patient_data['emergency_phone'],
-                    'enrollment_date': date.today() - timedelta(days=365),  # Enrolled 1 year ago
-                    'benefit_year_start': date(date.today().year, 1, 1),  # Benefit year starts Jan 1
-                }
+        # Pass 1: insert missing patient profiles unlinked, with a placeholder member_id
+        # (the column is unique, and bulk_create skips Patient.save() which assigns it)
+        existing_patients = {
+            patient.user_id: patient
+            for patient in Patient.objects.filter(user__in=patient_users.values())
+        }
+        new_patients = Patient.objects.bulk_create([
+            Patient(
+                user=patient_users[patient_data['username']],
+                member_id=f"SEED-{patient_users[patient_data['username']].pk}",
+                date_of_birth=patient_data['dob'],
+                gender=patient_data['gender'],
+                scheme=schemes[patient_data['scheme']],
+                status=patient_data['status'],
+                phone=patient_data['phone'],
+                relationship=patient_data['relationship'],
+                emergency_contact=patient_data['emergency_contact'],
+                emergency_phone=patient_data['emergency_phone'],
+                enrollment_date=enrollment_date,
+                benefit_year_start=benefit_year_start,
             )
-
-            # Store principal members for dependent linking
-            if patient_data['relationship'] == 'PRINCIPAL':
-                principal_members[patient_data['last_name']] = patient
-
-            patients.append(patient)
+            for patient_data in patients_data
+            if patient_users[patient_data['username']].pk not in existing_patients
+        ], batch_size=self.batch_size)
+        patients_by_user = {**existing_patients, **{patient.user_id: patient for patient in new_patients}}
+        patients = [patients_by_user[patient_users[patient_data['username']].pk] for patient_data in patients_data]
+
+        # Pass 2: link spouses to the principal with the same last name and assign member IDs
+        # the way Patient.save() would
+        principal_members = {
+            patient_data['last_name']: patient
+            for patient_data, patient in zip(patients_data, patients)
+            if patient_data['relationship'] == 'PRINCIPAL'
+        }
+        dependent_counts = Counter(dict(
+            Patient.objects.filter(principal_member__in=principal_members.values())
+            .values_list('principal_member')
+            .annotate(n=Count('id'))
+        ))
+        new_patient_ids = {patient.pk for patient in new_patients}
+        for patient_data, patient in zip(patients_data, patients):
+            if patient.pk in new_patient_ids and patient_data['relationship'] == 'SPOUSE':
+                patient.principal_member = principal_members.get(patient_data['last_name'])
+        # Principals first, so dependents build on their final member_id
+        for patient in sorted(new_patients, key=lambda patient: patient.principal_member is not None):
+            if patient.principal_member is None:
+                patient.member_id = f"MBR-{patient.pk:05d}"
+            else:
+                principal = patient.principal_member
+                dependent_counts[principal.pk] += 1
+                patient.member_id = f"{principal.member_id}-D{dependent_counts[principal.pk]:02d}"
+        Patient.objects.bulk_update(new_patients, ['principal_member', 'member_id'], batch_size=self.batch_size)
 
         # Create comprehensive sample claims with realistic scenarios
-        if not Claim.objects.exists():
+        if not self.skip_claims and not Claim.objects.exists():
             now = timezone.now()
             claims_data = [
                 # VIP Premium member claims
@@ -484,33 +573,49 @@ class Command(BaseCommand):
                 },
             ]
 
-            for claim_data in claims_data:
-                claim = Claim.objects.create(
+            # Every timestamp the claims need, keyed by days before now
+            days_before = {
+                days: now - timedelta(days=days)
+                for claim_data in claims_data
+                for days in (claim_data['days_ago'] - 1, claim_data['days_ago'], claim_data['days_ago'] + 1)
+            }
+
+            # One INSERT per model; Postgres hands back the claim PKs for the invoices
+            claims = Claim.objects.bulk_create([
+                Claim(
                     patient=claim_data['patient'],
                     provider=claim_data['provider'],
                     service_type=benefit_types[claim_data['service_type']],
                     cost=claim_data['cost'],
-                    date_submitted=now - timedelta(days=claim_data['days_ago']),
-                    date_of_service=(now - timedelta(days=claim_data['days_ago'] + 1)).date(),
+                    date_submitted=days_before[claim_data['days_ago']],
+                    date_of_service=days_before[claim_data['days_ago'] + 1].date(),
                     status=claim_data['status'],
                     priority=claim_data.get('priority', 'NORMAL'),
                     diagnosis_code=claim_data['diagnosis_code'],
                     notes=claim_data['notes'],
                     coverage_checked=claim_data['status'] in ['APPROVED', 'REJECTED'],
-                    processed_date=now - timedelta(days=claim_data['days_ago'] - 1) if claim_data['status'] in ['APPROVED', 'REJECTED'] else None,
+                    processed_date=days_before[claim_data['days_ago'] - 1] if claim_data['status'] in ['APPROVED', 'REJECTED'] else None,
                     processed_by=admin if claim_data['status'] in ['APPROVED', 'REJECTED'] else None,
                     preauth_number=claim_data.get('preauth_number', ''),
                     rejection_reason=claim_data.get('rejection_reason', ''),
-                    rejection_date=now - timedelta(days=claim_data['days_ago'] - 1) if claim_data['status'] == 'REJECTED' else None
+                    rejection_date=days_before[claim_data['days_ago'] - 1] if claim_data['status'] == 'REJECTED' else None
+                )
+                for claim_data in claims_data
+            ], batch_size=self.batch_size)
+
+            # Create invoices for approved claims
+            Invoice.objects.bulk_create([
+                Invoice(
+                    claim=claim,
+                    amount=claim.cost,
+                    payment_status=claim_data.get('invoice_status', 'PENDING')
                 )
+                for claim, claim_data in zip(claims, claims_data)
+                if claim_data.get('create_invoice')
+            ], batch_size=self.batch_size)
 
-                # Create invoices for approved claims
-                if claim_data.get('create_invoice'):
-                    invoice = Invoice.objects.create(
-                        claim=claim,
-                        amount=claim.cost,
-                        payment_status=claim_data.get('invoice_status', 'PENDING')
-                    )
+            # bulk_create skips the post_save signal that maintains BenefitUsage
+            call_command('backfill_benefit_usage')
 
         # Seed system settings
         self.stdout.write('\nSeeding system settings...')
@@ -568,6 +673,7 @@ class Command(BaseCommand):
         from schemes.models import SchemeCategory, SchemeBenefit, BenefitType
         from claims.models import Patient, Claim, Invoice
         from accounts.models import ProviderProfile
+        from core.models import SystemSettings
 
         User = get_user_model()
 
@@ -575,62 +681,53 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('📊 DATABASE SEEDING SUMMARY'))
         self.stdout.write('='*60)
 
-        # User statistics
-        total_users = User.objects.count()
-        admins = User.objects.filter(role='ADMIN').count()
-        providers = User.objects.filter(role='PROVIDER').count()
-        patients = User.objects.filter(role='PATIENT').count()
-
-        self.stdout.write(f'\n👥 USER ACCOUNTS:')
-        self.stdout.write(f'  • Total Users: {total_users}')
-        self.stdout.write(f'  • Administrators: {admins}')
-        self.stdout.write(f'  • Healthcare Providers: {providers}')
-        self.stdout.write(f'  • Patients: {patients}')
-
-        # Provider details
-        provider_profiles = ProviderProfile.objects.count()
-        self.stdout.write(f'\n🏥 PROVIDER PROFILES: {provider_profiles}')
-
-        # Medical schemes
-        schemes = SchemeCategory.objects.count()
-        benefits = SchemeBenefit.objects.count()
-        benefit_types = BenefitType.objects.count()
-
-        self.stdout.write(f'\n💼 MEDICAL SCHEMES:')
-        self.stdout.write(f'  • Scheme Categories: {schemes}')
-        self.stdout.write(f'  • Benefit Types: {benefit_types}')
-        self.stdout.write(f'  • Scheme Benefits: {benefits}')
-
-        # Patient data
-        patient_profiles = Patient.objects.count()
-        active_patients = Patient.objects.filter(status='ACTIVE').count()
-        suspended_patients = Patient.objects.filter(status='SUSPENDED').count()
-
-        self.stdout.write(f'\n👨‍👩‍👧‍👦 PATIENT DATA:')
-        self.stdout.write(f'  • Total Patient Profiles: {patient_profiles}')
-        self.stdout.write(f'  • Active Members: {active_patients}')
-        self.stdout.write(f'  • Suspended Members: {suspended_patients}')
-
-        # Claims and billing
-        total_claims = Claim.objects.count()
-        approved_claims = Claim.objects.filter(status='APPROVED').count()
-        pending_claims = Claim.objects.filter(status='PENDING').count()
-        rejected_claims = Claim.objects.filter(status='REJECTED').count()
-        invoices = Invoice.objects.count()
-        paid_invoices = Invoice.objects.filter(payment_status='PAID').count()
-
-        self.stdout.write(f'\n📋 CLAIMS & BILLING:')
-        self.stdout.write(f'  • Total Claims: {total_claims}')
-        self.stdout.write(f'  • Approved Claims: {approved_claims}')
-        self.stdout.write(f'  • Pending Claims: {pending_claims}')
-        self.stdout.write(f'  • Rejected Claims: {rejected_claims}')
-        self.stdout.write(f'  • Total Invoices: {invoices}')
-        self.stdout.write(f'  • Paid Invoices: {paid_invoices}')
-
-        # System settings
-        from core.models import SystemSettings
-        settings_count = SystemSettings.objects.count()
-        self.stdout.write(f'\n⚙️  SYSTEM SETTINGS: {settings_count}')
+        # One aggregate per model rather than a COUNT query per line
+        users = User.objects.aggregate(
+            total=Count('id'),
+            admins=Count('id', filter=Q(role='ADMIN')),
+            providers=Count('id', filter=Q(role='PROVIDER')),
+            patients=Count('id', filter=Q(role='PATIENT')),
+        )
+        patients = Patient.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='ACTIVE')),
+            suspended=Count('id', filter=Q(status='SUSPENDED')),
+        )
+        claims = Claim.objects.aggregate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status='APPROVED')),
+            pending=Count('id', filter=Q(status='PENDING')),
+            rejected=Count('id', filter=Q(status='REJECTED')),
+        )
+        invoices = Invoice.objects.aggregate(
+            total=Count('id'),
+            paid=Count('id', filter=Q(payment_status='PAID')),
+        )
+
+        self.stdout.write('\n'.join([
+            f'\n👥 USER ACCOUNTS:',
+            f'  • Total Users: {users["total"]}',
+            f'  • Administrators: {users["admins"]}',
+            f'  • Healthcare Providers: {users["providers"]}',
+            f'  • Patients: {users["patients"]}',
+            f'\n🏥 PROVIDER PROFILES: {ProviderProfile.objects.count()}',
+            f'\n💼 MEDICAL SCHEMES:',
+            f'  • Scheme Categories: {SchemeCategory.objects.count()}',
+            f'  • Benefit Types: {BenefitType.objects.count()}',
+            f'  • Scheme Benefits: {SchemeBenefit.objects.count()}',
+            f'\n👨‍👩‍👧‍👦 PATIENT DATA:',
+            f'  • Total Patient Profiles: {patients["total"]}',
+            f'  • Active Members: {patients["active"]}',
+            f'  • Suspended Members: {patients["suspended"]}',
+            f'\n📋 CLAIMS & BILLING:',
+            f'  • Total Claims: {claims["total"]}',
+            f'  • Approved Claims: {claims["approved"]}',
+            f'  • Pending Claims: {claims["pending"]}',
+            f'  • Rejected Claims: {claims["rejected"]}',
+            f'  • Total Invoices: {invoices["total"]}',
+            f'  • Paid Invoices: {invoices["paid"]}',
+            f'\n⚙️  SYSTEM SETTINGS: {SystemSettings.objects.count()}',
+        ]))
 
         self.stdout.write('\n' + '='*60)
         self.stdout.write(self.style.SUCCESS('✅ SEEDING COMPLETE - READY FOR DEVELOPMENT!'))
@@ -2,132 +2,131 @@
 Management command to seed EDI validation rules for X12 transactions.
 """
 
+import os
+
 from django.core.management.base import BaseCommand
+
+from core.cache import EDI_VALIDATION_RULES_KEY, delete_on_commit
 from core.models import EDIValidationRule
 
 
-class Command(BaseCommand):
-    help = 'Seed EDI validation rules for X12 transactions'
+# ISA segment validation rules
+ISA_RULES = (
+    {
+        'rule_name': 'ISA_Sender_ID_Required',
+        'rule_type': 'REQUIRED_ELEMENT',
+        'segment_id': 'ISA',
+        'element_position': 6,
+        'element_name': 'Sender ID',
+        'required': True,
+        'min_length': 2,
+        'max_length': 15,
+        'error_code': 'ISA001',
+        'error_message': 'ISA Sender ID is required and must be 2-15 characters',
+    },
+    {
+        'rule_name': 'ISA_Receiver_ID_Required',
+        'rule_type': 'REQUIRED_ELEMENT',
+        'segment_id': 'ISA',
+        'element_position': 8,
+        'element_name': 'Receiver ID',
+        'required': True,
+        'min_length': 2,
+        'max_length': 15,
+        'error_code': 'ISA002',
+        'error_message': 'ISA Receiver ID is required and must be 2-15 characters',
+    },
+    {
+        'rule_name': 'ISA_Date_Format',
+        'rule_type': 'FORMAT_VALIDATION',
+        'segment_id': 'ISA',
+        'element_position': 9,
+        'element_name': 'Date',
+        'required': True,
+        'regex_pattern': r'^\d{6}$',
+        'error_code': 'ISA003',
+        'error_message': 'ISA Date must be in YYMMDD format',
+    },
+    {
+        'rule_name': 'ISA_Time_Format',
+        'rule_type': 'FORMAT_VALIDATION',
+        'segment_id': 'ISA',
+        'element_position': 10,
+        'element_name': 'Time',
+        'required': True,
+        'regex_pattern': r'^\d{4}$',
+        'error_code': 'ISA004',
+        'error_message': 'ISA Time must be in HHMM format',
+    },
+)
 
-    def handle(self, *args, **options):
-        self.stdout.write('Seeding EDI validation rules...')
+# GS segment validation rules
+GS_RULES = (
+    {
+        'rule_name': 'GS_Functional_ID_Valid',
+        'rule_type': 'CODE_VALIDATION',
+        'segment_id': 'GS',
+        'element_position': 1,
+        'element_name': 'Functional ID',
+        'required': True,
+        'valid_codes': ['HC', 'HP', 'HR', 'HI'],
+        'error_code': 'GS001',
+        'error_message': 'GS Functional ID must be HC (Health Care), HP (Property), HR (Human Resources), or HI (Health Care Institutional)',
+    },
+    {
+        'rule_name': 'GS_Version_Valid',
+        'rule_type': 'FORMAT_VALIDATION',
+        'segment_id': 'GS',
+        'element_position': 8,
+        'element_name': 'Version',
+        'required': True,
+        'regex_pattern': r'^\d{3}$',
+        'error_code': 'GS002',
+        'error_message': 'GS Version must be a 3-digit number',
+    },
+)
 
-        # ISA segment validation rules
-        isa_rules = [
-            {
-                'rule_name': 'ISA_Sender_ID_Required',
-                'rule_type': 'REQUIRED_ELEMENT',
-                'segment_id': 'ISA',
-                'element_position': 6,
-                'element_name': 'Sender ID',
-                'required': True,
-                'min_length': 2,
-                'max_length': 15,
-                'error_code': 'ISA001',
-                'error_message': 'ISA Sender ID is required and must be 2-15 characters',
-            },
-            {
-                'rule_name': 'ISA_Receiver_ID_Required',
-                'rule_type': 'REQUIRED_ELEMENT',
-                'segment_id': 'ISA',
-                'element_position': 8,
-                'element_name': 'Receiver ID',
-                'required': True,
-                'min_length': 2,
-                'max_length': 15,
-                'error_code': 'ISA002',
-                'error_message': 'ISA Receiver ID is required and must be 2-15 characters',
-            },
-            {
-                'rule_name': 'ISA_Date_Format',
-                'rule_type': 'FORMAT_VALIDATION',
-                'segment_id': 'ISA',
-                'element_position': 9,
-                'element_name': 'Date',
-                'required': True,
-                'regex_pattern': r'^\d{6}$',
-                'error_code': 'ISA003',
-                'error_message': 'ISA Date must be in YYMMDD format',
-            },
-            {
-                'rule_name': 'ISA_Time_Format',
-                'rule_type': 'FORMAT_VALIDATION',
-                'segment_id': 'ISA',
-                'element_position': 10,
-                'element_name': 'Time',
-                'required': True,
-                'regex_pattern': r'^\d{4}$',
-                'error_code': 'ISA004',
-                'error_message': 'ISA Time must be in HHMM format',
-            },
-        ]
+# ST segment validation rules
+ST_RULES = (
+    {
+        'rule_name': 'ST_Transaction_Set_ID_Valid',
+        'rule_type': 'CODE_VALIDATION',
+        'segment_id': 'ST',
+        'element_position': 1,
+        'element_name': 'Transaction Set ID',
+        'required': True,
+        'valid_codes': ['837', '835', '270', '271', '276', '277'],
+        'error_code': 'ST001',
+        'error_message': 'ST Transaction Set ID must be a valid healthcare transaction type (837, 835, 270, 271, 276, 277)',
+    },
+)
 
-        # GS segment validation rules
-        gs_rules = [
-            {
-                'rule_name': 'GS_Functional_ID_Valid',
-                'rule_type': 'CODE_VALIDATION',
-                'segment_id': 'GS',
-                'element_position': 1,
-                'element_name': 'Functional ID',
-                'required': True,
-                'valid_codes': ['HC', 'HP', 'HR', 'HI'],
-                'error_code': 'GS001',
-                'error_message': 'GS Functional ID must be HC (Health Care), HP (Property), HR (Human Resources), or HI (Health Care Institutional)',
-            },
-            {
-                'rule_name': 'GS_Version_Valid',
-                'rule_type': 'FORMAT_VALIDATION',
-                'segment_id': 'GS',
-                'element_position': 8,
-                'element_name': 'Version',
-                'required': True,
-                'regex_pattern': r'^\d{3}$',
-                'error_code': 'GS002',
-                'error_message': 'GS Version must be a 3-digit number',
-            },
-        ]
+# Every rule seeded, built once at import
+ALL_RULES = ISA_RULES + GS_RULES + ST_RULES
 
-        # ST segment validation rules
-        st_rules = [
-            {
-                'rule_name': 'ST_Transaction_Set_ID_Valid',
-                'rule_type': 'CODE_VALIDATION',
-                'segment_id': 'ST',
-                'element_position': 1,
-                'element_name': 'Transaction Set ID',
-                'required': True,
-                'valid_codes': ['837', '835', '270', '271', '276', '277'],
-                'error_code': 'ST001',
-                'error_message': 'ST Transaction Set ID must be a valid healthcare transaction type (837, 835, 270, 271, 276, 277)',
-            },
-        ]
+# Columns refreshed on existing rules when the command is re-run
+SEEDED_FIELDS = sorted({key for rule_data in ALL_RULES for key in rule_data} - {'rule_name'})
 
-        # Create all rules
-        all_rules = isa_rules + gs_rules + st_rules
 
-        created_count = 0
-        updated_count = 0
+class Command(BaseCommand):
+    help = 'Seed EDI validation rules for X12 transactions'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Seeding EDI validation rules...')
+
+        batch_size = int(os.getenv('EDI_SEED_BATCH_SIZE', '100'))
 
-        for rule_data in all_rules:
-            rule, created = EDIValidationRule.objects.get_or_create(
-                rule_name=rule_data['rule_name'],
-                defaults=rule_data
-            )
-            if created:
-                created_count += 1
-                self.stdout.write(f"  Created: {rule.rule_name}")
-            else:
-                # Update existing rule
-                for key, value in rule_data.items():
-                    setattr(rule, key, value)
-                rule.save()
-                updated_count += 1
-                self.stdout.write(f"  Updated: {rule.rule_name}")
+        # INSERT ... ON CONFLICT (rule_name) DO UPDATE: new rules are added, existing ones refreshed
+        EDIValidationRule.objects.bulk_create(
+            [EDIValidationRule(**rule_data) for rule_data in ALL_RULES],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['rule_name'],
+            update_fields=SEEDED_FIELDS + ['updated_at'],
+        )
+        # Bulk writes skip the post_save receiver that drops the cached rule set
+        delete_on_commit(EDI_VALIDATION_RULES_KEY)
 
         self.stdout.write(
-            self.style.SUCCESS(
-                f'Successfully processed {created_count + updated_count} EDI validation rules '
-                f'({created_count} created, {updated_count} updated)'
-            )
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'Successfully processed {len(ALL_RULES)} EDI validation rules')
+        )
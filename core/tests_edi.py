@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase, TestCase
+
+from core.edi_service import EDIProcessor, X12Parser
+from core.models import EDITransaction
+
+
+# 837 sample from test/test_edi_system.py, trimmed to the envelope and one claim
+SAMPLE_837 = """ISA*00*          *00*          *ZZ*SENDERID       *ZZ*RECEIVERID     *240101*1200*^*00501*000000001*0*P*:~
+GS*HC*SENDERID*RECEIVERID*20240101*120000*1*X*005010X222A1~
+ST*837*0001*005010X222A1~
+BHT*0019*00*123456*20240101*1200*CH~
+NM1*IL*1*PATIENT*LAST*FIRST*M***MI*123456789~
+CLM*CLAIM123*100.00***11:B:1*Y*A*Y*Y~
+HI*BK:8901*BF:V700~
+SE*6*0001~
+GE*1*1~
+IEA*1*000000001~"""
+
+
+class X12ParserTests(SimpleTestCase):
+    def assert_sample_parsed(self, content):
+        parser = X12Parser(content)
+        parsed = parser.parse()
+        self.assertEqual(parser.errors, [])
+        self.assertEqual(len(parser.segments), 10)
+        self.assertEqual(parsed['interchange']['sender_id'].strip(), 'SENDERID')
+        self.assertEqual(parsed['interchange']['trailer']['control_number'], '000000001')
+        self.assertEqual(len(parsed['functional_groups']), 1)
+        transactions = parsed['functional_groups'][0]['transactions']
+        self.assertEqual(len(transactions), 1)
+        self.assertEqual(transactions[0]['transaction_set_id'], '837')
+        self.assertEqual(transactions[0]['trailer']['segment_count'], '6')
+        self.assertEqual([seg['segment_id'] for seg in transactions[0]['segments']], ['BHT', 'NM1', 'CLM', 'HI'])
+        self.assertEqual(transactions[0]['segments'][3]['elements'], [['BK', '8901'], ['BF', 'V700']])
+        return parser
+
+    def test_multi_line_sample(self):
+        self.assert_sample_parsed(SAMPLE_837)
+
+    def test_single_line_interchange(self):
+        self.assert_sample_parsed(SAMPLE_837.replace('\n', ''))
+
+    def test_separators_come_from_isa_header(self):
+        custom = SAMPLE_837.replace('*', '|').replace(':', '>').replace('~', '!')
+        parser = self.assert_sample_parsed(custom)
+        self.assertEqual(parser.element_separator, '|')
+        self.assertEqual(parser.component_separator, '>')
+
+    def test_unpadded_interchange_splits_on_line_breaks(self):
+        # Unpadded ISA: position 105 is not the segment terminator
+        content = (
+            "ISA*00**00**ZZ*SENDER*ZZ*RECEIVER*240101*1200*^*00501*000000001*0*P*:\n"
+            "GS*HC*SENDER*RECEIVER*20240101*1200*1*X*005010X222A1\n"
+            "ST*837*0001\n"
+            "CLM*CLAIM123*100.00***11:B:1\n"
+            "SE*3*0001\n"
+            "GE*1*1\n"
+            "IEA*1*000000001"
+        )
+        self.assertGreaterEqual(len(content), 106)
+        parser = X12Parser(content)
+        parsed = parser.parse()
+        self.assertEqual(parser.errors, [])
+        self.assertEqual([seg['segment_id'] for seg in parser.segments], ['ISA', 'GS', 'ST', 'CLM', 'SE', 'GE', 'IEA'])
+        self.assertEqual(parsed['interchange']['sender_id'], 'SENDER')
+        self.assertEqual(parser.segments[3]['elements'][4], ['11', 'B', '1'])
+
+    def test_rejects_content_without_isa_header(self):
+        parser = X12Parser(SAMPLE_837.split('\n', 1)[1])
+        self.assertEqual(parser.parse(), {})
+        self.assertEqual(parser.errors, ['X12 content must start with an ISA interchange header'])
+        parser = X12Parser('   ')
+        self.assertEqual(parser.parse(), {})
+        self.assertEqual(parser.errors, ['No segments found in X12 content'])
+
+
+class EDIBatchTests(TestCase):
+    def test_batch_reports_bad_row_and_stores_the_rest(self):
+        # Short line-split interchange whose sender ID is longer than the 15-character column
+        bad = "ISA*00**00**ZZ*ABCDEFGHIJKLMNOPQRST*ZZ*RECEIVER*240101*1200*^*00501*000000002*0*P*:\nIEA*1*000000002"
+        results = EDIProcessor().process_edi_batch(
+            [SAMPLE_837, bad, SAMPLE_837], EDITransaction.TransactionType.CLAIM_SUBMISSION
+        )
+        self.assertEqual([success for success, _, _ in results], [True, False, True])
+        self.assertTrue(results[1][1].startswith('Processing error'))
+        self.assertEqual(results[1][2], {})
+        stored = set(EDITransaction.objects.values_list('transaction_id', flat=True))
+        self.assertEqual(stored, {results[0][2]['transaction_id'], results[2][2]['transaction_id']})
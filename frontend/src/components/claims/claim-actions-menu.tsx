@@ -185,9 +185,9 @@ export function ClaimActionsMenu({ claim, userRole, userId, onClaimUpdate, onVie
       const response = await api.post(`/api/claims/${claim.id}/reject/`, {
         reason: reason.trim()
       })
-      const data = response as { detail?: string; claim: Claim }
+      const data = response as { detail?: string; claim: Partial<Claim> }
       showToast(data.detail || 'Claim rejected successfully', 'success')
-      onClaimUpdate(data.claim)
+      onClaimUpdate({ ...claim, ...data.claim })
     } catch (error: any) {
       const message = error.response?.data?.detail || error.message || 'Failed to reject claim'
       showToast(message, 'error')
@@ -204,9 +204,9 @@ export function ClaimActionsMenu({ claim, userRole, userId, onClaimUpdate, onVie
       const response = await api.post(`/api/claims/${claim.id}/investigate/`, {
         notes: notes?.trim() || 'Under investigation'
       })
-      const data = response as { detail?: string; claim: Claim }
+      const data = response as { detail?: string; claim: Partial<Claim> }
       showToast(data.detail || 'Claim marked for investigation', 'success')
-      onClaimUpdate(data.claim)
+      onClaimUpdate({ ...claim, ...data.claim })
     } catch (error: any) {
       const message = error.response?.data?.detail || error.message || 'Failed to mark claim for investigation'
       showToast(message, 'error')